@@ -0,0 +1,166 @@
+"""
+-------------------------------------------------
+Group 1 - Project Name
+Created on: 2025-03-11
+Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
+-------------------------------------------------
+
+Description:
+This script benchmarks the models of the repository (mission_1, step_4 and its
+vectorized version, robot_mission_1/test.py and Corr_TP/MoneyModel.py) at several grid sizes.
+For each (model, scale) it measures the initialization time, the mean time
+per step and the peak memory, each case running in its own process so that
+models sharing module names (model.py, agents.py) do not clash.
+
+Usage:
+python benchmarks/bench_models.py --output bench_results.json
+python benchmarks/bench_models.py --models step_4 --scales demo medium
+python benchmarks/bench_models.py --models step_4_vector --scales site
+"""
+
+import argparse
+import importlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Grid size, robots per colour, initial wastes per colour and number of timed steps
+SCALES = {
+    "demo": {"width": 12, "height": 10, "robots": 2, "green_waste": 10, "yellow_waste": 8, "red_waste": 8, "steps": 200},
+    "medium": {"width": 100, "height": 100, "robots": 100, "green_waste": 700, "yellow_waste": 560, "red_waste": 560, "steps": 50},
+    "large": {"width": 500, "height": 500, "robots": 1000, "green_waste": 17500, "yellow_waste": 14000, "red_waste": 14000, "steps": 10},
+    # Large site targeted by the vectorized model; slow and memory hungry for the others, hence not run by default
+    "site": {"width": 1000, "height": 1000, "robots": 2000, "green_waste": 70000, "yellow_waste": 56000, "red_waste": 56000, "steps": 100},
+}
+DEFAULT_SCALES = ["demo", "medium", "large"]
+
+
+def build_robot_mission(module, scale, seed):
+    mission_class = getattr(module, "VectorRobotMission", None) or module.RobotMission
+    return mission_class(
+        width=scale["width"],
+        height=scale["height"],
+        initial_green_waste=scale["green_waste"],
+        initial_yellow_waste=scale["yellow_waste"],
+        initial_red_waste=scale["red_waste"],
+        nb_green_agent=scale["robots"],
+        nb_yellow_agent=scale["robots"],
+        nb_red_agent=scale["robots"],
+        log_level=None,
+        seed=seed,
+    )
+
+
+def build_waste_model(module, scale, seed):
+    return module.WasteModel(
+        num_green=scale["robots"],
+        num_yellow=scale["robots"],
+        num_red=scale["robots"],
+        width=scale["width"],
+        height=scale["height"],
+        seed=seed,
+    )
+
+
+def build_money_model(module, scale, seed):
+    return module.MoneyModel(n=3 * scale["robots"], width=scale["width"], height=scale["height"], seed=seed)
+
+
+# Model name -> (directory added to sys.path, module to import, builder)
+MODELS = {
+    "mission_1": ("mission_1", "model", build_robot_mission),
+    "step_4": (os.path.join("step_4", "step_4"), "model", build_robot_mission),
+    "step_4_vector": (os.path.join("step_4", "step_4"), "vector_model", build_robot_mission),
+    "robot_mission_1": ("robot_mission_1", "test", build_waste_model),
+    "money_model": ("Corr_TP", "MoneyModel", build_money_model),
+}
+
+
+def run_case(model_name, scale_name, seed):
+    """Builds and steps one model in the current process and returns its measurements."""
+    directory, module_name, builder = MODELS[model_name]
+    scale = SCALES[scale_name]
+    sys.path.insert(0, os.path.join(ROOT, directory))
+    # Imports (mesa, numpy...) are not part of the initialization time
+    module = importlib.import_module(module_name)
+    # ru_maxrss is reported in kilobytes on Linux
+    import_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    start = time.perf_counter()
+    model = builder(module, scale, seed)
+    init_time = time.perf_counter() - start
+
+    step_times = []
+    for _ in range(scale["steps"]):
+        start = time.perf_counter()
+        model.step()
+        step_times.append(time.perf_counter() - start)
+
+    total_step_time = sum(step_times)
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        "model": model_name,
+        "scale": scale_name,
+        "width": scale["width"],
+        "height": scale["height"],
+        "robots": 3 * scale["robots"],
+        "steps": len(step_times),
+        "init_s": init_time,
+        "step_mean_s": total_step_time / len(step_times),
+        "step_max_s": max(step_times),
+        "steps_per_s": len(step_times) / total_step_time if total_step_time else None,
+        "peak_rss_mb": peak_rss_mb,
+        # Peak memory above what the interpreter and the imports already used
+        "model_peak_mb": peak_rss_mb - import_rss_mb,
+    }
+
+
+def run_case_in_subprocess(model_name, scale_name, seed, timeout):
+    command = [sys.executable, os.path.abspath(__file__), "--worker", model_name, scale_name, "--seed", str(seed)]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout, cwd=ROOT)
+    except subprocess.TimeoutExpired:
+        return {"model": model_name, "scale": scale_name, "error": f"timed out after {timeout}s"}
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()
+        return {"model": model_name, "scale": scale_name, "error": error[-1] if error else "failed"}
+    # The worker prints its result as the last line; models may print before it
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the models of the repository.")
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=DEFAULT_SCALES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=1800, help="seconds allowed per case")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--worker", nargs=2, metavar=("MODEL", "SCALE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_case(*args.worker, args.seed)))
+        return
+
+    results = []
+    for model_name in args.models:
+        for scale_name in args.scales:
+            result = run_case_in_subprocess(model_name, scale_name, args.seed, args.timeout)
+            results.append(result)
+            if "error" in result:
+                print(f"{model_name:16} {scale_name:7} ERROR {result['error']}")
+            else:
+                print(f"{model_name:16} {scale_name:7} init {result['init_s']:8.3f}s  "
+                      f"step {result['step_mean_s'] * 1000:9.2f}ms  model peak {result['model_peak_mb']:8.1f}MB")
+
+    with open(args.output, "w") as f:
+        json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
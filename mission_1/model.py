@@ -12,17 +12,24 @@ and now also handles communication between robots.
 
 from mesa import Model, DataCollector
 from mesa.space import MultiGrid
-import random as py_random
 from agents import GreenRobot, YellowRobot, RedRobot  
-from objects import Waste, WasteDisposalZone, Radioactivity 
+from objects import Waste, WasteDisposalZone, build_zone_layers
 from schedule import RandomActivationScheduler
+from events import EventLog, DEBUG, INFO, agent_label
+
+# Highest zone id each robot type is allowed to enter
+MAX_ZONE = {GreenRobot: 1, YellowRobot: 2, RedRobot: 3}
 
 class RobotMission(Model):
-    def __init__(self, width, height, initial_green_waste, initial_yellow_waste, initial_red_waste, nb_yellow_agent, nb_green_agent, nb_red_agent):
-        super().__init__() 
-        self.random = py_random.Random()
+    def __init__(self, width, height, initial_green_waste, initial_yellow_waste, initial_red_waste, nb_yellow_agent, nb_green_agent, nb_red_agent, log_level=INFO, log_capacity=1000, seed=None):
+        # La graine pilote self.random (ordre du scheduler, placements, déplacements) et self.rng (radioactivité, oubli de la carte)
+        super().__init__(seed=seed)
+        self.seed = seed
         self.grid = MultiGrid(width, height, False)
         self.schedule = RandomActivationScheduler(self)
+        self.current_id = 0
+        # Journal des événements (log_level=None pour les runs sans affichage)
+        self.events = EventLog(log_level, log_capacity)
         self.initial_green_waste = initial_green_waste
         self.initial_yellow_waste = initial_yellow_waste
         self.initial_red_waste = initial_red_waste
@@ -31,18 +38,8 @@ class RobotMission(Model):
         self.nb_red_agent = nb_red_agent
 
         l = self.grid.width // 3
-        for x in range(self.grid.width):
-            for y in range(self.grid.height):
-                if x < l:
-                    zone = "z1"
-                elif x < 2 * l:
-                    zone = "z2"
-                else:
-                    zone = "z3"
-                radioactivity_agent = Radioactivity(self.schedule.get_agent_count(), self, zone)
-                self.grid.place_agent(radioactivity_agent, (x, y))
-                self.schedule.add(radioactivity_agent)
-                
+        self.zone_map, self.radioactivity_map = build_zone_layers(width, height, self.rng)
+
         z_width = l
         height = self.grid.height
         self.datacollector = DataCollector({
@@ -59,19 +56,19 @@ class RobotMission(Model):
 
         for _ in range(self.nb_green_agent):
             x, y = find_empty_cell(0, z_width - 1, height, self.grid)
-            robot = GreenRobot(self.schedule.get_agent_count(), self)
+            robot = GreenRobot(self.next_id(), self)
             self.schedule.add(robot)
             self.grid.place_agent(robot, (x, y))
 
         for _ in range(self.nb_yellow_agent):
             x, y = find_empty_cell(0, 2 * z_width - 1, height, self.grid)
-            robot = YellowRobot(self.schedule.get_agent_count(), self)
+            robot = YellowRobot(self.next_id(), self)
             self.schedule.add(robot)
             self.grid.place_agent(robot, (x, y))
 
         for _ in range(self.nb_red_agent):
             x, y = find_empty_cell(0, self.grid.width - 1, height, self.grid)
-            robot = RedRobot(self.schedule.get_agent_count(), self)
+            robot = RedRobot(self.next_id(), self)
             self.schedule.add(robot)
             self.grid.place_agent(robot, (x, y))
             
@@ -81,20 +78,21 @@ class RobotMission(Model):
             self.place_waste_in_zone("yellow", z_width, 2 * z_width - 1, height)
         for _ in range(initial_red_waste):
             self.place_waste_in_zone("red", 2 * z_width, width - 1, height)
+        self.initial_waste_count = initial_green_waste + initial_yellow_waste + initial_red_waste
             
         for y in range(height):
             dz1_pos = (z_width - 1, y)
-            dz1_agent = WasteDisposalZone(self.schedule.get_agent_count(), self)
+            dz1_agent = WasteDisposalZone(self.next_id(), self)
             self.grid.place_agent(dz1_agent, dz1_pos)
             self.schedule.add(dz1_agent)
 
             dz2_pos = (2 * z_width - 1, y)
-            dz2_agent = WasteDisposalZone(self.schedule.get_agent_count(), self)
+            dz2_agent = WasteDisposalZone(self.next_id(), self)
             self.grid.place_agent(dz2_agent, dz2_pos)
             self.schedule.add(dz2_agent)
 
             dz3_pos = (self.grid.width - 1, y)
-            dz3_agent = WasteDisposalZone(self.schedule.get_agent_count(), self)
+            dz3_agent = WasteDisposalZone(self.next_id(), self)
             self.grid.place_agent(dz3_agent, dz3_pos)
             self.schedule.add(dz3_agent)
 
@@ -102,8 +100,19 @@ class RobotMission(Model):
         self.schedule.step()
         self.datacollector.collect(self)
 
+    def next_id(self):
+        "Returns a fresh unique_id (the agent count cannot be reused once wastes are removed)."
+        self.current_id += 1
+        return self.current_id
+
+    def collected_waste_fraction(self):
+        "Share of the initial waste count no longer lying on the grid, as used for the 90% criterion."
+        if self.initial_waste_count == 0:
+            return 1.0
+        return 1 - self.schedule.get_type_count(Waste) / self.initial_waste_count
+
     def place_waste_in_zone(self, waste_type, x_start, x_end, height):
-        waste = Waste(self.schedule.get_agent_count(), self, waste_type=waste_type)
+        waste = Waste(self.next_id(), self, waste_type=waste_type)
         while True:
             pos = (self.random.randrange(x_start, x_end), self.random.randrange(height))
             self.grid.place_agent(waste, pos)
@@ -119,16 +128,20 @@ class RobotMission(Model):
                     agent.knowledge["collected_waste"].append(content)
                     self.grid.remove_agent(content)
                     self.schedule.remove(content)
-                    print(f"{agent} collected {content}")
+                    if self.events.level <= INFO:
+                        self.events.record(self.schedule.steps, INFO, "collect", "{robot} collected {waste_type} waste {waste_id}",
+                                           robot=agent_label(agent), waste_type=content.waste_type, waste_id=content.unique_id)
                     break  
         elif action == "transform_waste":
             # For GreenRobot: transform two green wastes into yellow waste and notify a YellowRobot.
             if isinstance(agent, GreenRobot) and len(agent.knowledge["collected_waste"]) == 2:
                 agent.knowledge["collected_waste"].clear()
-                yellow_waste = Waste(self.schedule.get_agent_count(), self, waste_type="yellow")
+                yellow_waste = Waste(self.next_id(), self, waste_type="yellow")
                 self.grid.place_agent(yellow_waste, agent.pos)
                 self.schedule.add(yellow_waste)
-                print(f"{agent} transformed green waste into yellow waste: {yellow_waste}")
+                if self.events.level <= INFO:
+                    self.events.record(self.schedule.steps, INFO, "transform", "{robot} transformed green waste into yellow waste {waste_id}",
+                                       robot=agent_label(agent), waste_id=yellow_waste.unique_id)
                 closest_yellow = self.get_closest_agent(agent.pos, YellowRobot)
                 if closest_yellow is not None:
                     message = {"type": "pick_up_waste", "waste_id": yellow_waste.unique_id, "location": agent.pos}
@@ -136,10 +149,12 @@ class RobotMission(Model):
             # For YellowRobot: transform two yellow wastes into red waste and notify a RedRobot.
             if isinstance(agent, YellowRobot) and len(agent.knowledge["collected_waste"]) == 2:
                 agent.knowledge["collected_waste"].clear()
-                red_waste = Waste(self.schedule.get_agent_count(), self, waste_type="red")
+                red_waste = Waste(self.next_id(), self, waste_type="red")
                 self.grid.place_agent(red_waste, agent.pos)
                 self.schedule.add(red_waste)
-                print(f"{agent} transformed yellow waste into red waste: {red_waste}")
+                if self.events.level <= INFO:
+                    self.events.record(self.schedule.steps, INFO, "transform", "{robot} transformed yellow waste into red waste {waste_id}",
+                                       robot=agent_label(agent), waste_id=red_waste.unique_id)
                 closest_red = self.get_closest_agent(agent.pos, RedRobot)
                 if closest_red is not None:
                     message = {"type": "pick_up_waste", "waste_id": red_waste.unique_id, "location": agent.pos}
@@ -152,15 +167,18 @@ class RobotMission(Model):
                     for waste in agent.knowledge["collected_waste"]:
                         self.grid.place_agent(waste, agent.pos)
                         agent.knowledge["collected_waste"].clear()
-                        print(f"{agent} disposed yellow waste")
+                        if self.events.level <= INFO:
+                            self.events.record(self.schedule.steps, INFO, "dispose", "{robot} disposed yellow waste", robot=agent_label(agent))
                 elif isinstance(agent, YellowRobot): 
                     for waste in agent.knowledge["collected_waste"]:
                         self.grid.place_agent(waste, agent.pos)
                         agent.knowledge["collected_waste"].clear()
-                        print(f"{agent} disposed red waste")
+                        if self.events.level <= INFO:
+                            self.events.record(self.schedule.steps, INFO, "dispose", "{robot} disposed red waste", robot=agent_label(agent))
                 elif isinstance(agent, RedRobot):
                     agent.knowledge["collected_waste"].clear()
-                    print(f"{agent} disposed red waste")
+                    if self.events.level <= INFO:
+                        self.events.record(self.schedule.steps, INFO, "dispose", "{robot} disposed red waste", robot=agent_label(agent))
 
     def is_in_disposal_zone(self, agent):
         z_width = self.grid.width // 3
@@ -174,26 +192,21 @@ class RobotMission(Model):
 
     def move_robot(self, robot, new_position):
         if not self.is_position_allowed(robot, new_position):
+            if self.events.level <= DEBUG:
+                self.events.record(self.schedule.steps, DEBUG, "blocked", "Move not allowed for {robot} to {position}",
+                                   robot=agent_label(robot), position=new_position)
             return
         contents = self.grid.get_cell_list_contents(new_position)
         if any(isinstance(c, (GreenRobot, YellowRobot, RedRobot)) for c in contents):
+            if self.events.level <= DEBUG:
+                self.events.record(self.schedule.steps, DEBUG, "blocked", "Cell {position} is occupied, {robot} stays",
+                                   robot=agent_label(robot), position=new_position)
             return
         self.grid.move_agent(robot, new_position)
 
     def is_position_allowed(self, robot, position):
-        contents = self.grid.get_cell_list_contents(position)
-        radioactivity_agents = [agent for agent in contents if hasattr(agent, "zone")]
-        if not radioactivity_agents:
-            return False
-        zone = radioactivity_agents[0].zone      
-        if isinstance(robot, GreenRobot) and zone == "z1":
-            return True
-        elif isinstance(robot, YellowRobot) and (zone == "z1" or zone == "z2"):
-            return True
-        elif isinstance(robot, RedRobot):
-            return True        
-        return False
-    
+        return bool(self.zone_map[position] <= MAX_ZONE[type(robot)])
+
     def move_agent_towards_disposal_zone(self, agent):
         x, y = agent.pos
         z_width = self.grid.width // 3
@@ -232,4 +245,6 @@ class RobotMission(Model):
     def send_message(self, recipient, message):
         if hasattr(recipient, "inbox"):
             recipient.inbox.append(message)
-            print(f"Message sent to agent {recipient.unique_id}: {message}")
+            if self.events.level <= INFO:
+                self.events.record(self.schedule.steps, INFO, "message", "Message sent to agent {recipient}: {message}",
+                                   recipient=recipient.unique_id, message=message)
@@ -10,25 +10,24 @@ This script depicts the different zones, their waste and radioactivity.
 """
 
 from mesa import Agent
-import random
+import numpy as np
+
+# Radioactivity range of each zone id stored in RobotMission.zone_map (1 = z1, 2 = z2, 3 = z3)
+RADIOACTIVITY_RANGES = {1: (0, 0.33), 2: (0.33, 0.66), 3: (0.66, 1)}
+
+
+def build_zone_layers(width, height, rng):
+    """Returns the zone id map and the radioactivity level map of the grid, indexed by [x, y]."""
+    l = width // 3
+    zone_map = np.full((width, height), 3, dtype=np.int8)
+    zone_map[:l] = 1
+    zone_map[l:2 * l] = 2
+    radioactivity_map = np.empty((width, height), dtype=np.float32)
+    for zone, (low, high) in RADIOACTIVITY_RANGES.items():
+        mask = zone_map == zone
+        radioactivity_map[mask] = rng.uniform(low, high, size=int(mask.sum()))
+    return zone_map, radioactivity_map
 
-class Radioactivity(Agent):
-    """A non-behavioral agent representing the level of radioactivity in a zone."""
-    def __init__(self, unique_id, model, zone):
-        # Fixed initialization for Mesa 3.1.4
-        self.unique_id = unique_id
-        self.model = model
-        self.pos = None  # Initialize pos attribute to None
-        self.zone = zone
-        self.radioactivity = self.assign_radioactivity_level(zone)
-        
-    def assign_radioactivity_level(self, zone):
-        if zone == "z1":
-            return random.uniform(0, 0.33)
-        elif zone == "z2":
-            return random.uniform(0.33, 0.66)
-        else:  # zone "z3"
-            return random.uniform(0.66, 1)
 
 class WasteDisposalZone(Agent):
     """A non-behavioral agent indicating the waste disposal zone."""
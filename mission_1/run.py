@@ -21,7 +21,7 @@ from mesa.visualization.utils import update_counter
 
 from model import RobotMission 
 from agents import GreenRobot, YellowRobot, RedRobot
-from objects import Radioactivity, WasteDisposalZone, Waste
+from objects import WasteDisposalZone, Waste
 import os 
 import plotly.graph_objects as go
 
@@ -40,16 +40,10 @@ model = RobotMission(
 current_model = solara.reactive(model)
 step_count = solara.reactive(0)
 waste_history = []
-journal_logs = []
+JOURNAL_LENGTH = 10
 action_stats = {"GreenRobot": 0, "YellowRobot": 0, "RedRobot": 0}
 
 
-def log_action(message):
-    journal_logs.append(f"[Step {step_count.value}] {message}")
-    if len(journal_logs) > 10:
-        journal_logs.pop(0)
-
-
 def update_waste_history():
     counts = {"green": 0, "yellow": 0, "red": 0}
     for agent in current_model.value.schedule.agents:
@@ -136,6 +130,7 @@ def render_lineplot():
 
 
 def render_journal():
+    journal_logs = current_model.value.events.messages(JOURNAL_LENGTH)
     if not journal_logs:
         return solara.Markdown("_No activity yet._")
     return solara.Markdown("\n".join(journal_logs))
@@ -166,7 +161,7 @@ def Page():
     nb_red_agent_val = solara.reactive(2)
 
     def reset_model():
-        global waste_history, journal_logs, action_stats
+        global waste_history, action_stats
         current_model.value = RobotMission(
             width=width_val.value,
             height=height_val.value,
@@ -179,7 +174,6 @@ def Page():
         )
         step_count.value = 0
         waste_history = []
-        journal_logs = []
         for key in action_stats:
             action_stats[key] = 0
         update_waste_history()
@@ -13,7 +13,6 @@ This script contains the schedulers
 from collections import defaultdict
 from mesa.agent import Agent
 from typing import Callable, Dict, Iterator, List, Optional, Type, Union
-import random
 
 class BaseScheduler:
     """Base scheduler class that serves as the basis for all other scheduler classes."""
@@ -80,7 +79,7 @@ class BaseScheduler:
         """Simple generator that yields an iterator of all agents."""
         agent_list = list(self._agents.values())
         if shuffled:
-            random.shuffle(agent_list)
+            self.model.random.shuffle(agent_list)
         for agent in agent_list:
             yield agent
 
@@ -123,11 +122,11 @@ class RandomActivationScheduler(BaseScheduler):
     def step(self) -> None:
         """Executes the step of each agent type in random order."""
         agent_types = list(self.agents_by_type.keys())
-        random.shuffle(agent_types)
+        self.model.random.shuffle(agent_types)
 
         for agent_type in agent_types:
             agents = list(self.agents_by_type[agent_type].values())
-            random.shuffle(agents)
+            self.model.random.shuffle(agents)
             for agent in agents:
                 agent.step()
 
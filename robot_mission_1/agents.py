@@ -61,12 +61,11 @@ class GreenAgent(Agent):
         neighbors = self.model.grid.get_neighborhood(self.pos, moore=False, include_center=False)
         allowed_neighbors = [pos for pos in neighbors if self.model.is_position_allowed(self, pos)]
         # Choose the neighbor with the least pheromones
-        next_move = min(allowed_neighbors, key=lambda pos: (self.model.pheromone_levels['green'][pos], random.random()))
+        next_move = min(allowed_neighbors, key=lambda pos: (self.model.pheromone_level('green', pos), random.random()))
         return next_move
 
     def deposit_pheromone(self):
-        x, y = self.pos
-        self.model.pheromone_levels['green'][(x, y)] += 1  # Only update green pheromone levels
+        self.model.deposit_pheromone('green', self.pos)  # Only update green pheromone levels
 
     def do(self, action):
         """Perform an action and update the environment and knowledge accordingly."""
@@ -118,12 +117,11 @@ class YellowAgent(Agent):
         neighbors = self.model.grid.get_neighborhood(self.pos, moore=False, include_center=False)
         allowed_neighbors = [pos for pos in neighbors if self.model.is_position_allowed(self, pos)]
         # Choose the neighbor with the least pheromones
-        next_move = min(allowed_neighbors, key=lambda pos: (self.model.pheromone_levels['yellow'][pos], random.random()))
+        next_move = min(allowed_neighbors, key=lambda pos: (self.model.pheromone_level('yellow', pos), random.random()))
         return next_move
 
     def deposit_pheromone(self):
-        x, y = self.pos
-        self.model.pheromone_levels['yellow'][(x, y)] += 1  # Only update yellow pheromone levels
+        self.model.deposit_pheromone('yellow', self.pos)  # Only update yellow pheromone levels
 
     def do(self, action):
         """Perform an action and update the environment and knowledge accordingly."""
@@ -164,12 +162,11 @@ class RedAgent(Agent):
     def move_to_least_visited(self):
         neighbors = self.model.grid.get_neighborhood(self.pos, moore=False, include_center=False)
         # Choose the neighbor with the least pheromones
-        next_move = min(neighbors, key=lambda pos: (self.model.pheromone_levels['red'][pos], random.random()))
+        next_move = min(neighbors, key=lambda pos: (self.model.pheromone_level('red', pos), random.random()))
         return next_move
 
     def deposit_pheromone(self):
-        x, y = self.pos
-        self.model.pheromone_levels['red'][(x, y)] += 1  # Only update red pheromone levels
+        self.model.deposit_pheromone('red', self.pos)  # Only update red pheromone levels
 
     def do(self, action):
         """Perform an action and update the environment and knowledge accordingly."""
@@ -17,10 +17,13 @@ Defines the RobotMission model and its logic.
 from mesa import Agent, Model
 from mesa.space import MultiGrid
 import random
+import numpy as np
 from agents import GreenAgent, YellowAgent, RedAgent, RandomActivationScheduler
 from objects import Waste, WasteDisposalZone, RadioactivityAgent 
 from mesa.datacollection import DataCollector
 
+PHEROMONE_CHANNELS = {"green": 0, "yellow": 1, "red": 2}
+
 class RobotMission(Model):
     def __init__(
         self, 
@@ -31,18 +34,18 @@ class RobotMission(Model):
         initial_red_waste,
         nb_yellow_agent,
         nb_green_agent,
-        nb_red_agent
+        nb_red_agent,
+        lazy_pheromone_decay=False
     ):
         super().__init__() 
         self.grid = MultiGrid(width, height, torus=False)
         
-        # Pheromone levels
-        self.pheromone_levels = {
-            'green': {(x, y): 0 for x in range(width) for y in range(height)},
-            'yellow': {(x, y): 0 for x in range(width) for y in range(height)},
-            'red': {(x, y): 0 for x in range(width) for y in range(height)}
-        }
+        # Pheromone levels, one float32 layer per robot colour (see PHEROMONE_CHANNELS), indexed by [channel, x, y]
+        self.pheromone_levels = np.zeros((len(PHEROMONE_CHANNELS), width, height), dtype=np.float32)
         self.pheromone_decay_rate = 0.1  # 10% decay rate per step
+        # With lazy decay, a cell only catches up on the decay it missed when it is read or written
+        self.lazy_pheromone_decay = lazy_pheromone_decay
+        self.pheromone_last_update = np.zeros((len(PHEROMONE_CHANNELS), width, height), dtype=np.int32)
         self.schedule = RandomActivationScheduler(self)
 
         self.initial_green_waste = initial_green_waste
@@ -144,12 +147,28 @@ class RobotMission(Model):
                     print(f"Cell ({x}, {y}) is in zone {radioactivity_agent.zone}")
 
     def decay_pheromones(self):
-        for (x, y), level in self.pheromone_levels['green'].items():
-            self.pheromone_levels['green'][(x, y)] = max(level - self.pheromone_decay_rate, 0)
-        for (x, y), level in self.pheromone_levels['yellow'].items():
-            self.pheromone_levels['yellow'][(x, y)] = max(level - self.pheromone_decay_rate, 0)
-        for (x, y), level in self.pheromone_levels['red'].items():
-            self.pheromone_levels['red'][(x, y)] = max(level - self.pheromone_decay_rate, 0)
+        """Applies one step of decay to every pheromone layer in place (no-op with lazy decay)."""
+        if self.lazy_pheromone_decay:
+            return
+        levels = self.pheromone_levels
+        np.subtract(levels, self.pheromone_decay_rate, out=levels)
+        np.maximum(levels, 0, out=levels)
+
+    def pheromone_level(self, colour, pos):
+        """Returns the pheromone level of a colour at pos."""
+        index = (PHEROMONE_CHANNELS[colour], pos[0], pos[1])
+        if self.lazy_pheromone_decay:
+            # decay_pheromones would have run once per completed schedule step
+            elapsed = self.schedule.steps - self.pheromone_last_update[index]
+            if elapsed:
+                level = self.pheromone_levels[index] - elapsed * self.pheromone_decay_rate
+                self.pheromone_levels[index] = level if level > 0 else 0
+                self.pheromone_last_update[index] = self.schedule.steps
+        return self.pheromone_levels[index]
+
+    def deposit_pheromone(self, colour, pos, amount=1):
+        level = self.pheromone_level(colour, pos)
+        self.pheromone_levels[PHEROMONE_CHANNELS[colour], pos[0], pos[1]] = level + amount
 
     def step(self):
         self.schedule.step()
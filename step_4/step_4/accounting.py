@@ -0,0 +1,66 @@
+"""
+-------------------------------------------------
+Group 1 - Project Name
+Created on: 2025-03-11
+Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
+-------------------------------------------------
+
+Description:
+This script contains the waste counters (per state and per zone) and the
+DataCollector reporters shared by RobotMission and VectorRobotMission, and
+the collected fraction (the 90% criterion) that batch.py and the stop
+conditions compare between the two backends.
+"""
+
+from objects import RADIOACTIVITY_RANGES
+
+WASTE_TYPES = ("green", "yellow", "red")
+WASTE_STATES = ("ground", "carried", "transformed", "disposed")
+
+
+class WasteAccounting:
+    """
+    Mixin of the models: `waste_counts[state][waste_type]` and `ground_waste_by_zone[zone][waste_type]`,
+    kept up to date by the model, the initial waste count and the DataCollector reporters.
+    """
+
+    def init_waste_counts(self, initial_green_waste, initial_yellow_waste, initial_red_waste):
+        "Sets every counter to zero; the model then counts the initial wastes on the ground as it places them."
+        self.waste_counts = {state: dict.fromkeys(WASTE_TYPES, 0) for state in WASTE_STATES}
+        self.ground_waste_by_zone = {zone: dict.fromkeys(WASTE_TYPES, 0) for zone in RADIOACTIVITY_RANGES}
+        self.initial_waste_count = initial_green_waste + initial_yellow_waste + initial_red_waste
+
+    @staticmethod
+    def waste_reporters():
+        "Model reporters of the DataCollector, the same columns for both backends."
+        return {
+            "Waste": lambda m: m.count_waste("ground"),
+            "Green Waste": lambda m: m.waste_counts["ground"]["green"],
+            "Yellow Waste": lambda m: m.waste_counts["ground"]["yellow"],
+            "Red Waste": lambda m: m.waste_counts["ground"]["red"],
+            "Carried Waste": lambda m: m.count_waste("carried"),
+            "Disposed Waste": lambda m: m.count_waste("disposed"),
+            "Transformed Waste": lambda m: m.count_waste("transformed"),
+            # Déchets au sol par zone : "Zone 1 Waste", "Zone 2 Waste", "Zone 3 Waste"
+            **{f"Zone {zone} Waste": (lambda m, zone=zone: m.count_ground_waste_in_zone(zone)) for zone in RADIOACTIVITY_RANGES},
+        }
+
+    def collected_waste_fraction(self):
+        "Share of the initial waste count no longer lying on the grid, as used for the 90% criterion."
+        if self.initial_waste_count == 0:
+            return 1.0
+        return 1 - self.count_waste("ground") / self.initial_waste_count
+
+    def count_waste(self, state, waste_type=None):
+        "Number of wastes in a state (ground, carried, transformed, disposed), optionally of one type."
+        counts = self.waste_counts[state]
+        if waste_type is not None:
+            return counts[waste_type]
+        return counts["green"] + counts["yellow"] + counts["red"]
+
+    def count_ground_waste_in_zone(self, zone, waste_type=None):
+        "Number of wastes lying in a zone, optionally of one type."
+        counts = self.ground_waste_by_zone[zone]
+        if waste_type is not None:
+            return counts[waste_type]
+        return counts["green"] + counts["yellow"] + counts["red"]
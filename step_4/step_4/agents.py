@@ -7,49 +7,66 @@ Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
 
 Description:
 This script defines the Radioactive and robot agents.
-Now, robots can communicate: when a transformation occurs,
-the transforming robot sends a message to the closest agent of the next type.
+Now, robots can communicate: when a transformation occurs, the model posts
+a pickup job for the new waste, and the job queue (jobs.py) gives it to the
+closest available robot of the next type (no target, not already assigned,
+room to carry it) with a PICK_UP_WASTE message through the message bus.
 """
 
 from mesa import Agent
 from objects import Waste
+from messages import PICK_UP_WASTE
+
+
+class RobotState:
+    """What a robot knows about itself, read by deliberate at every step."""
+    __slots__ = ("collected_waste", "waste_here", "current_position", "target_location", "is_exploring", "inbox",
+                 "frontier_target")
+
+    def __init__(self):
+        self.collected_waste = []
+        self.waste_here = False
+        self.current_position = None
+        self.target_location = None
+        self.is_exploring = False
+        self.inbox = []
+        # Frontier cell the robot heads to once its surroundings are explored
+        self.frontier_target = None
+
 
 class GreenRobot(Agent):
+    capacity = 2  # wastes carried at most
+
     def __init__(self, unique_id, model):
         self.unique_id = unique_id
         self.model = model
         self.pos = None
-        self.knowledge = {
-            "collected_waste": [],
-            "waste_here": False,
-            "current_position": None,
-            "target_location": None,
-            "is_exploring": False,
-        }
-        self.inbox = []
+        self.knowledge = RobotState()
 
     def percepts(self):
         contents = self.model.grid.get_cell_list_contents([self.pos])
         waste_here = any(isinstance(c, Waste) and c.waste_type == "green" for c in contents)
-        self.knowledge.update({"waste_here": waste_here, "current_position": self.pos})
-        if self.knowledge["is_exploring"]:
-            self.model.explored_map[self.pos] = True
+        knowledge = self.knowledge
+        knowledge.waste_here = waste_here
+        knowledge.current_position = self.pos
+        if knowledge.is_exploring:
+            self.model.mark_explored(self.pos)
         
     def deliberate(self, knowledge):
-        if knowledge["waste_here"] and len(knowledge["collected_waste"]) < 2:
+        if knowledge.waste_here and len(knowledge.collected_waste) < 2:
             return "collect_waste"
-        elif len(knowledge["collected_waste"]) == 2:
+        elif len(knowledge.collected_waste) == 2:
             return "transform_waste"
-        elif len(knowledge["collected_waste"]) == 1 and knowledge["collected_waste"][0].waste_type == "yellow":
+        elif len(knowledge.collected_waste) == 1 and knowledge.collected_waste[0].waste_type == "yellow":
             return "dispose_waste"
         else:
-            self.knowledge["is_exploring"] = True
+            self.knowledge.is_exploring = True
             return "move_smartly"
 
     def do(self, action):
         if action in ["collect_waste", "dispose_waste", "transform_waste"]:
             self.model.perform_action(self, action)
-            self.knowledge["is_exploring"] = False
+            self.knowledge.is_exploring = False
         elif action == "move_randomly":
             possible_steps = self.model.grid.get_neighborhood(self.pos, moore=False, include_center=False)
             new_position = self.model.random.choice(possible_steps)
@@ -58,22 +75,24 @@ class GreenRobot(Agent):
             self.move_smartly()
     
     def move_smartly(self):
-        possible_steps = self.model.grid.get_neighborhood(self.pos, moore=False, include_center=False)
-        
-        # Filtrer les positions qui sont accessibles
-        allowed_positions = [pos for pos in possible_steps if self.model.is_position_allowed(self, pos)]
+        # Voisins accessibles précalculés par le modèle pour ce type de robot
+        allowed_positions = self.model.allowed_neighbors(type(self), self.pos)
         
         if not allowed_positions:
             return  # Aucun mouvement possible
         
         # Vérifier si des cellules non explorées sont disponibles
-        unexplored_positions = [pos for pos in allowed_positions if not self.model.explored_map.get(pos, False)]
+        explored_map = self.model.explored_map
+        unexplored_positions = [pos for pos in allowed_positions if not explored_map[pos]]
         
         # S'il existe des cellules non explorées, en choisir une au hasard
         if unexplored_positions:
             target_pos = self.model.random.choice(unexplored_positions)
+        elif self.model.move_towards_frontier(self):
+            # Sinon, se diriger vers la frontière d'exploration la plus proche
+            return
         else:
-            # Sinon, choisir aléatoirement parmi toutes les positions autorisées
+            # À défaut, choisir aléatoirement parmi toutes les positions autorisées
             target_pos = self.model.random.choice(allowed_positions)
         
         # Vérifier si la position est déjà occupée par un autre robot
@@ -82,55 +101,56 @@ class GreenRobot(Agent):
             self.model.move_robot(self, target_pos)
 
     def step(self):
+        if self.model.profiler is not None:
+            self.model.profiler.profile_step(self)
+            return
         self.percepts()
         action = self.deliberate(self.knowledge)
         self.do(action)
 
 class YellowRobot(Agent):
+    capacity = 2  # wastes carried at most
+
     def __init__(self, unique_id, model):
         self.unique_id = unique_id
         self.model = model
         self.pos = None
-        self.knowledge = {
-            "collected_waste": [],
-            "waste_here": False,
-            "current_position": None,
-            "target_location": None,
-            "is_exploring": False,
-        }
-        self.inbox = []
+        self.knowledge = RobotState()
 
     def percepts(self):
         contents = self.model.grid.get_cell_list_contents([self.pos])
         waste_here = any(isinstance(c, Waste) and c.waste_type == "yellow" for c in contents)
-        self.knowledge.update({"waste_here": waste_here, "current_position": self.pos})
-        if self.knowledge["is_exploring"]:
-            self.model.explored_map[self.pos] = True
+        knowledge = self.knowledge
+        knowledge.waste_here = waste_here
+        knowledge.current_position = self.pos
+        if knowledge.is_exploring:
+            self.model.mark_explored(self.pos)
         
     def process_messages(self):
-        for message in self.inbox:
-            if message.get("type") == "pick_up_waste":
-                self.knowledge["target_location"] = message.get("location")
-                self.knowledge["is_exploring"] = False  # Arrêter l'exploration quand un message est reçu
-        self.inbox.clear()
+        inbox = self.knowledge.inbox
+        for message in inbox:
+            if message.kind == PICK_UP_WASTE:
+                self.knowledge.target_location = message.location
+                self.knowledge.is_exploring = False  # Arrêter l'exploration quand un message est reçu
+        inbox.clear()
 
     def deliberate(self, knowledge):
-        if knowledge.get("target_location") is not None and knowledge["current_position"] != knowledge["target_location"]:
+        if knowledge.target_location is not None and knowledge.current_position != knowledge.target_location:
             return "move_to_target"
         # Otherwise, follow normal behavior.
-        if knowledge["waste_here"] and len(knowledge["collected_waste"]) < 2:
+        if knowledge.waste_here and len(knowledge.collected_waste) < 2:
             return "collect_waste"
-        elif len(knowledge["collected_waste"]) == 2:
+        elif len(knowledge.collected_waste) == 2:
             return "transform_waste"
-        elif len(knowledge["collected_waste"]) == 1 and knowledge["collected_waste"][0].waste_type == "red":
+        elif len(knowledge.collected_waste) == 1 and knowledge.collected_waste[0].waste_type == "red":
             return "dispose_waste"
         else:
             # Commencer l'exploration à la recherche de déchets
-            self.knowledge["is_exploring"] = True
+            self.knowledge.is_exploring = True
             return "move_smartly"
 
     def move_towards_target(self):
-        target = self.knowledge["target_location"]
+        target = self.knowledge.target_location
         if target is None:
             return
         x, y = self.pos
@@ -152,25 +172,27 @@ class YellowRobot(Agent):
         self.model.move_robot(self, new_position)
         # Clear target if reached
         if new_position == target:
-            self.knowledge["target_location"] = None
+            self.knowledge.target_location = None
 
     def move_smartly(self):
-        possible_steps = self.model.grid.get_neighborhood(self.pos, moore=False, include_center=False)
-        
-        # Filtrer les positions qui sont accessibles
-        allowed_positions = [pos for pos in possible_steps if self.model.is_position_allowed(self, pos)]
+        # Voisins accessibles précalculés par le modèle pour ce type de robot
+        allowed_positions = self.model.allowed_neighbors(type(self), self.pos)
         
         if not allowed_positions:
             return  # Aucun mouvement possible
         
         # Vérifier si des cellules non explorées sont disponibles
-        unexplored_positions = [pos for pos in allowed_positions if not self.model.explored_map.get(pos, False)]
+        explored_map = self.model.explored_map
+        unexplored_positions = [pos for pos in allowed_positions if not explored_map[pos]]
         
         # S'il existe des cellules non explorées, en choisir une au hasard
         if unexplored_positions:
             target_pos = self.model.random.choice(unexplored_positions)
+        elif self.model.move_towards_frontier(self):
+            # Sinon, se diriger vers la frontière d'exploration la plus proche
+            return
         else:
-            # Sinon, choisir aléatoirement parmi toutes les positions autorisées
+            # À défaut, choisir aléatoirement parmi toutes les positions autorisées
             target_pos = self.model.random.choice(allowed_positions)
         
         # Vérifier si la position est déjà occupée par un autre robot
@@ -182,7 +204,7 @@ class YellowRobot(Agent):
         if action in ["collect_waste", "dispose_waste", "transform_waste"]:
             self.model.perform_action(self, action)
             # Fin de l'exploration quand une action est effectuée
-            self.knowledge["is_exploring"] = False
+            self.knowledge.is_exploring = False
         elif action == "move_randomly":
             possible_steps = self.model.grid.get_neighborhood(self.pos, moore=False, include_center=False)
             new_position = self.model.random.choice(possible_steps)
@@ -193,6 +215,9 @@ class YellowRobot(Agent):
             self.move_smartly()
 
     def step(self):
+        if self.model.profiler is not None:
+            self.model.profiler.profile_step(self)
+            return
         self.process_messages()
         self.percepts()
         action = self.deliberate(self.knowledge)
@@ -201,48 +226,45 @@ class YellowRobot(Agent):
 
 
 class RedRobot(Agent):
+    capacity = 1  # wastes carried at most
+
     def __init__(self, unique_id, model):
         self.unique_id = unique_id
         self.model = model
         self.pos = None
-        # Extend knowledge for target messages.
-        self.knowledge = {
-            "collected_waste": [],
-            "waste_here": False,
-            "current_position": None,
-            "target_location": None,
-            "is_exploring": False,
-        }
-        self.inbox = []
+        self.knowledge = RobotState()
 
     def percepts(self):
         contents = self.model.grid.get_cell_list_contents([self.pos])
         waste_here = any(isinstance(c, Waste) and c.waste_type == "red" for c in contents)
-        self.knowledge.update({"waste_here": waste_here, "current_position": self.pos})
-        if self.knowledge["is_exploring"]:
-            self.model.explored_map[self.pos] = True
+        knowledge = self.knowledge
+        knowledge.waste_here = waste_here
+        knowledge.current_position = self.pos
+        if knowledge.is_exploring:
+            self.model.mark_explored(self.pos)
         
     def process_messages(self):
-        for message in self.inbox:
-            if message.get("type") == "pick_up_waste":
-                self.knowledge["target_location"] = message.get("location")
-                self.knowledge["is_exploring"] = False  # Arrêter l'exploration quand un message est reçu
-        self.inbox.clear()
+        inbox = self.knowledge.inbox
+        for message in inbox:
+            if message.kind == PICK_UP_WASTE:
+                self.knowledge.target_location = message.location
+                self.knowledge.is_exploring = False  # Arrêter l'exploration quand un message est reçu
+        inbox.clear()
 
     def deliberate(self, knowledge):
-        if knowledge.get("target_location") is not None and knowledge["current_position"] != knowledge["target_location"]:
+        if knowledge.target_location is not None and knowledge.current_position != knowledge.target_location:
             return "move_to_target"
-        if knowledge["waste_here"] and len(knowledge["collected_waste"]) == 0:
+        if knowledge.waste_here and len(knowledge.collected_waste) == 0:
             return "collect_waste"
-        elif len(knowledge["collected_waste"]) == 1:
+        elif len(knowledge.collected_waste) == 1:
             return "dispose_waste"
         else:
             # Commencer l'exploration à la recherche de déchets
-            self.knowledge["is_exploring"] = True
+            self.knowledge.is_exploring = True
             return "move_smartly"
 
     def move_towards_target(self):
-        target = self.knowledge["target_location"]
+        target = self.knowledge.target_location
         if target is None:
             return
         x, y = self.pos
@@ -262,25 +284,27 @@ class RedRobot(Agent):
         new_position = (new_x, new_y)
         self.model.move_robot(self, new_position)
         if new_position == target:
-            self.knowledge["target_location"] = None
+            self.knowledge.target_location = None
 
     def move_smartly(self):
-        possible_steps = self.model.grid.get_neighborhood(self.pos, moore=False, include_center=False)
-        
-        # Prendre parmi les positions qui sont accessibles
-        allowed_positions = [pos for pos in possible_steps if self.model.is_position_allowed(self, pos)]
+        # Voisins accessibles précalculés par le modèle pour ce type de robot
+        allowed_positions = self.model.allowed_neighbors(type(self), self.pos)
         
         if not allowed_positions:
             return  # Aucun mouvement possible
         
         # Vérifier si des cellules non explorées sont disponibles
-        unexplored_positions = [pos for pos in allowed_positions if not self.model.explored_map.get(pos, False)]
+        explored_map = self.model.explored_map
+        unexplored_positions = [pos for pos in allowed_positions if not explored_map[pos]]
         
         # S'il existe des cellules non explorées, en choisir une au hasard
         if unexplored_positions:
             target_pos = self.model.random.choice(unexplored_positions)
+        elif self.model.move_towards_frontier(self):
+            # Sinon, se diriger vers la frontière d'exploration la plus proche
+            return
         else:
-            # Sinon, choisir aléatoirement parmi toutes les positions autorisées
+            # À défaut, choisir aléatoirement parmi toutes les positions autorisées
             target_pos = self.model.random.choice(allowed_positions)
         
         # Vérifier si la position est déjà occupée par un autre robot
@@ -292,7 +316,7 @@ class RedRobot(Agent):
         if action in ["collect_waste", "dispose_waste"]:
             self.model.perform_action(self, action)
             # Fin de l'exploration quand une action est effectuée
-            self.knowledge["is_exploring"] = False
+            self.knowledge.is_exploring = False
         elif action == "move_randomly":
             possible_steps = self.model.grid.get_neighborhood(self.pos, moore=False, include_center=False)
             new_position = self.model.random.choice(possible_steps)
@@ -303,6 +327,9 @@ class RedRobot(Agent):
             self.move_smartly()
 
     def step(self):
+        if self.model.profiler is not None:
+            self.model.profiler.profile_step(self)
+            return
         self.process_messages()
         self.percepts()
         action = self.deliberate(self.knowledge)
@@ -0,0 +1,208 @@
+"""
+-------------------------------------------------
+Group 1 - Project Name
+Created on: 2025-03-11
+Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
+-------------------------------------------------
+
+Description:
+This script runs the simulation headless over a grid of parameters,
+spreads the replicates over a process pool and reports, for every run,
+the number of steps before 90% of the wastes are collected.
+A run ends as soon as the model stops running (KPI reached, mission
+finished, or no progress for --stall-steps steps) or after --max-steps.
+Replicate r of a combination runs with seed base_seed + r, so results are
+reproducible and can be cached on disk between sweeps.
+--backend vector runs the vectorized VectorRobotMission instead of RobotMission.
+
+Usage:
+python batch.py --replicates 10 --param nb_green_agent=1,2,3 --output results.csv --cache-dir .batch_cache
+python batch.py --backend vector --param width=1000 --param height=1000 --param nb_green_agent=2000 --replicates 2
+"""
+
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from model import RobotMission
+from vector_model import VectorRobotMission
+from stopping import FINISHED, ALL_DISPOSED, KPI_REACHED, NO_PROGRESS
+
+DEFAULT_PARAMETERS = {
+    "width": 12,
+    "height": 10,
+    "initial_green_waste": 10,
+    "initial_yellow_waste": 8,
+    "initial_red_waste": 8,
+    "nb_green_agent": 2,
+    "nb_yellow_agent": 2,
+    "nb_red_agent": 2,
+}
+
+# Model class run by each backend
+BACKENDS = {"object": RobotMission, "vector": VectorRobotMission}
+
+
+def expand_parameter_grid(parameter_grid):
+    """Returns one parameter dict per combination; list values are swept, scalars are fixed."""
+    parameters = dict(DEFAULT_PARAMETERS)
+    parameters.update(parameter_grid)
+    names = list(parameters)
+    values = [v if isinstance(v, (list, tuple, range)) else [v] for v in parameters.values()]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def code_version():
+    """Hash of the simulation sources, so that cached results are ignored once the model code changes."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".py") and name != "run.py":
+            digest.update(name.encode())
+            with open(os.path.join(directory, name), "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """On-disk cache of run rows keyed by (parameters, seed, run settings, code version)."""
+
+    def __init__(self, directory, version=None):
+        self.directory = directory
+        self.version = version or code_version()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, parameters, seed, max_steps, kpi_fraction, backend="object", stall_steps=None):
+        payload = {
+            "backend": backend,
+            "parameters": parameters,
+            "seed": seed,
+            "max_steps": max_steps,
+            "kpi_fraction": kpi_fraction,
+            "stall_steps": stall_steps,
+            "version": self.version,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key):
+        path = os.path.join(self.directory, key + ".json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def put(self, key, row):
+        path = os.path.join(self.directory, key + ".json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(row, f)
+        os.replace(path + ".tmp", path)
+
+
+def run_single(parameters, replicate, seed=None, max_steps=1000, kpi_fraction=0.9, backend="object", stall_steps=None):
+    """Runs one simulation until the model stops running or max_steps, and returns its result row."""
+    start = time.perf_counter()
+    model = BACKENDS[backend](**parameters, log_level=None, seed=seed, kpi_fraction=kpi_fraction, stall_steps=stall_steps)
+    while model.running and model.steps < max_steps:
+        model.step()
+    triggered = model.stop_conditions.triggered
+    return {
+        **parameters,
+        "backend": backend,
+        "replicate": replicate,
+        "seed": seed,
+        "kpi_step": triggered.get(KPI_REACHED),
+        "finished_step": triggered.get(FINISHED),
+        "disposed_step": triggered.get(ALL_DISPOSED),
+        "stall_step": triggered.get(NO_PROGRESS),
+        "stop_reason": model.stop_conditions.reason(),
+        "final_step": model.steps,
+        "collected_fraction": model.collected_waste_fraction(),
+        "wall_clock": time.perf_counter() - start,
+    }
+
+
+def batch_run(parameter_grid=None, replicates=5, max_steps=1000, kpi_fraction=0.9, processes=None,
+              base_seed=0, cache_dir=None, backend="object", stall_steps=None):
+    """
+    Runs every parameter combination `replicates` times across a process pool.
+    Returns a tidy list of rows (one dict per run), ordered by combination then replicate.
+    With base_seed=None the runs are unseeded and never cached.
+    """
+    cache = ResultCache(cache_dir) if cache_dir is not None and base_seed is not None else None
+    rows = []
+    pending = []
+    for parameters in expand_parameter_grid(parameter_grid or {}):
+        for replicate in range(replicates):
+            seed = None if base_seed is None else base_seed + replicate
+            key = cache.key(parameters, seed, max_steps, kpi_fraction, backend, stall_steps) if cache else None
+            row = cache.get(key) if cache else None
+            if row is None:
+                pending.append((len(rows), key, (parameters, replicate, seed, max_steps, kpi_fraction, backend, stall_steps)))
+            rows.append(row)
+
+    if processes == 1 or len(pending) <= 1:
+        results = [run_single(*arguments) for _, _, arguments in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(run_single, *arguments) for _, _, arguments in pending]
+            results = [future.result() for future in futures]
+
+    for (index, key, _), row in zip(pending, results):
+        rows[index] = row
+        if cache:
+            cache.put(key, row)
+    return rows
+
+
+def to_dataframe(rows):
+    """Converts batch_run rows to a pandas DataFrame."""
+    import pandas as pd
+    return pd.DataFrame(rows)
+
+
+def write_csv(rows, path):
+    if not rows:
+        return
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def parse_parameter(text):
+    """Parses `name=v1,v2,...` into (name, [int values])."""
+    name, _, values = text.partition("=")
+    if name not in DEFAULT_PARAMETERS or not values:
+        raise argparse.ArgumentTypeError(f"expected one of {', '.join(DEFAULT_PARAMETERS)} as name=v1,v2,...")
+    return name, [int(v) for v in values.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless batch runs of RobotMission.")
+    parser.add_argument("--param", type=parse_parameter, action="append", default=[], help="name=v1,v2,... (repeatable)")
+    parser.add_argument("--replicates", type=int, default=5)
+    parser.add_argument("--max-steps", type=int, default=1000)
+    parser.add_argument("--kpi-fraction", type=float, default=0.9)
+    parser.add_argument("--stall-steps", type=int, default=None, help="stop a run after this many steps without progress")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first replicate")
+    parser.add_argument("--cache-dir", default=None, help="directory caching the results of seeded runs")
+    parser.add_argument("--output", default=None, help="CSV file to write the results to")
+    parser.add_argument("--backend", choices=list(BACKENDS), default="object", help="per-agent or vectorized model")
+    args = parser.parse_args()
+
+    rows = batch_run(dict(args.param), args.replicates, args.max_steps, args.kpi_fraction, args.processes,
+                     args.seed, args.cache_dir, args.backend, args.stall_steps)
+    if args.output:
+        write_csv(rows, args.output)
+    for row in rows:
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
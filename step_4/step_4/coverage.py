@@ -0,0 +1,137 @@
+"""
+-------------------------------------------------
+Group 1 - Project Name
+Created on: 2025-03-11
+Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
+-------------------------------------------------
+
+Description:
+This script contains the coverage pyramid of the explored map: counts of
+unexplored cells per tile and per zone, summed up a quadtree, used to find
+the nearest unexplored region and to draw the coverage heatmap.
+"""
+
+import heapq
+
+import numpy as np
+
+
+class CoveragePyramid:
+    """
+    Quadtree of unexplored-cell counts over the explored map (which must be updated in place).
+    Level 0 holds one count per `tile_size` x `tile_size` tile and per zone id; each level above
+    sums 2x2 nodes of the level below, up to a single root.
+    """
+
+    def __init__(self, zone_map, explored_map, tile_size=4):
+        self.zone_map = zone_map
+        self.explored_map = explored_map
+        self.tile_size = tile_size
+        self.width, self.height = zone_map.shape
+        self.nb_zones = int(zone_map.max())
+        self.tiles_x = -(-self.width // tile_size)
+        self.tiles_y = -(-self.height // tile_size)
+        size = 1
+        while size < max(self.tiles_x, self.tiles_y):
+            size *= 2
+        self.size = size
+        self.levels = []
+        # Number of cells of each zone per tile, for the coverage fractions
+        self.cells = self.tile_counts(np.ones_like(explored_map))
+        self.refresh()
+
+    def tile_counts(self, mask):
+        """Counts the true cells of mask per zone and per tile: array [zone, tile_x, tile_y] (index 0 unused)."""
+        side = self.size * self.tile_size
+        counts = np.zeros((self.nb_zones + 1, self.size, self.size), dtype=np.int32)
+        for zone in range(1, self.nb_zones + 1):
+            padded = np.zeros((side, side), dtype=np.int32)
+            padded[:self.width, :self.height] = mask & (self.zone_map == zone)
+            counts[zone] = padded.reshape(self.size, self.tile_size, self.size, self.tile_size).sum(axis=(1, 3))
+        return counts
+
+    def refresh(self):
+        """Rebuilds every level from the explored map (after many cells changed at once)."""
+        level = self.tile_counts(~self.explored_map)
+        self.levels = [level]
+        while level.shape[1] > 1:
+            level = level[:, 0::2, 0::2] + level[:, 1::2, 0::2] + level[:, 0::2, 1::2] + level[:, 1::2, 1::2]
+            self.levels.append(level)
+
+    def mark_explored(self, pos):
+        """Updates the counts for a cell that has just been explored: one decrement per level."""
+        zone = self.zone_map[pos]
+        tile_x = pos[0] // self.tile_size
+        tile_y = pos[1] // self.tile_size
+        for level in self.levels:
+            level[zone, tile_x, tile_y] -= 1
+            tile_x >>= 1
+            tile_y >>= 1
+
+    def mark_explored_cells(self, xs, ys):
+        """Vectorised mark_explored for an array of distinct cells that have just been explored."""
+        zones = self.zone_map[xs, ys].astype(np.int64)
+        tile_x = xs // self.tile_size
+        tile_y = ys // self.tile_size
+        for level in self.levels:
+            side = level.shape[1]
+            nodes, counts = np.unique((zones * side + tile_x) * side + tile_y, return_counts=True)
+            level.reshape(-1)[nodes] -= counts.astype(level.dtype)
+            tile_x = tile_x >> 1
+            tile_y = tile_y >> 1
+
+    def unexplored(self, max_zone=None):
+        """Number of unexplored cells in the zones up to max_zone (all zones by default)."""
+        return int(self.levels[-1][1:(max_zone or self.nb_zones) + 1].sum())
+
+    def nearest_unexplored(self, pos, max_zone=None):
+        """
+        Closest unexplored cell to pos in the zones up to max_zone, or None.
+        Best-first descent of the quadtree ordered by the distance from pos to each node,
+        skipping nodes without unexplored cells; only the cells of the reached tiles are read.
+        """
+        zones = slice(1, (max_zone or self.nb_zones) + 1)
+        x, y = pos
+        top = len(self.levels) - 1
+        if not self.levels[top][zones, 0, 0].any():
+            return None
+        # Entries (distance bound, level, i, j); level -1 marks an exact unexplored cell (i, j)
+        heap = [(0, top, 0, 0)]
+        while heap:
+            distance, level, i, j = heapq.heappop(heap)
+            if level < 0:
+                return (i, j)
+            if level == 0:
+                cell = self.nearest_cell_in_tile(i, j, x, y, zones.stop - 1)
+                if cell is not None:
+                    heapq.heappush(heap, (abs(cell[0] - x) + abs(cell[1] - y), -1, cell[0], cell[1]))
+                continue
+            # Children holding unexplored cells, read in one go
+            children = self.levels[level - 1][zones, 2 * i:2 * i + 2, 2 * j:2 * j + 2].any(axis=0)
+            span = self.tile_size << (level - 1)
+            for child_i in (2 * i, 2 * i + 1):
+                for child_j in (2 * j, 2 * j + 1):
+                    if not children[child_i - 2 * i, child_j - 2 * j]:
+                        continue
+                    low_x, low_y = child_i * span, child_j * span
+                    dx = low_x - x if x < low_x else max(x - (low_x + span - 1), 0)
+                    dy = low_y - y if y < low_y else max(y - (low_y + span - 1), 0)
+                    heapq.heappush(heap, (dx + dy, level - 1, child_i, child_j))
+        return None
+
+    def nearest_cell_in_tile(self, tile_x, tile_y, x, y, max_zone):
+        x0, y0 = tile_x * self.tile_size, tile_y * self.tile_size
+        x1, y1 = min(x0 + self.tile_size, self.width), min(y0 + self.tile_size, self.height)
+        free = ~self.explored_map[x0:x1, y0:y1] & (self.zone_map[x0:x1, y0:y1] <= max_zone)
+        cells = np.argwhere(free)
+        if len(cells) == 0:
+            return None
+        distances = np.abs(cells[:, 0] + x0 - x) + np.abs(cells[:, 1] + y0 - y)
+        best = cells[distances.argmin()]
+        return (int(best[0]) + x0, int(best[1]) + y0)
+
+    def explored_fraction(self):
+        """Share of explored cells per tile, as a [tile_x, tile_y] float array (the coverage heatmap)."""
+        unexplored = self.levels[0][1:].sum(axis=0)[:self.tiles_x, :self.tiles_y]
+        cells = self.cells[1:].sum(axis=0)[:self.tiles_x, :self.tiles_y]
+        return 1 - unexplored / cells
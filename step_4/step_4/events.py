@@ -0,0 +1,64 @@
+"""
+-------------------------------------------------
+Group 1 - Project Name
+Created on: 2025-03-11
+Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
+-------------------------------------------------
+
+Description:
+This script contains the event log of the model (collections, transformations,
+messages, blocked moves), kept in memory and read by the Solara journal.
+"""
+
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING"}
+
+
+class EventLog:
+    """
+    Leveled log of model events stored in a bounded ring buffer.
+    Callers check `log.level <= LEVEL` before recording, so a disabled log costs one comparison;
+    messages are only formatted when the records are read.
+    """
+
+    def __init__(self, level=INFO, capacity=1000, echo=False):
+        self.level = OFF if level is None else level
+        self.records = deque(maxlen=capacity)
+        self.echo = echo
+
+    def record(self, step, level, kind, template, **fields):
+        """Stores an event; `template` is formatted with `fields` when the event is read."""
+        if level < self.level:
+            return
+        event = (step, level, kind, template, fields)
+        self.records.append(event)
+        if self.echo:
+            print(self.format(event))
+
+    @staticmethod
+    def format(event):
+        step, level, kind, template, fields = event
+        return f"[Step {step}] {template.format(**fields)}"
+
+    def tail(self, n=None, min_level=None):
+        """Returns the last n events (all if n is None), oldest first."""
+        events = self.records
+        if min_level is not None:
+            events = [event for event in events if event[1] >= min_level]
+        events = list(events)
+        return events if n is None else events[-n:]
+
+    def messages(self, n=None, min_level=None):
+        return [self.format(event) for event in self.tail(n, min_level)]
+
+    def clear(self):
+        self.records.clear()
+
+
+def agent_label(agent):
+    return f"{type(agent).__name__} {agent.unique_id}"
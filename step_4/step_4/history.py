@@ -0,0 +1,79 @@
+"""
+-------------------------------------------------
+Group 1 - Project Name
+Created on: 2025-03-11
+Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
+-------------------------------------------------
+
+Description:
+This script contains the bounded history of the waste counts plotted by the
+Solara application, and its min/max downsampling to a fixed number of points.
+"""
+
+import numpy as np
+
+
+class SeriesHistory:
+    """
+    Preallocated ring buffer of (step, value_1, ..., value_n) rows.
+    Once `capacity` rows are stored the oldest ones are overwritten, so memory stays constant.
+    """
+
+    def __init__(self, names, capacity=100_000):
+        self.names = tuple(names)
+        self.capacity = capacity
+        self.rows = np.zeros((capacity, 1 + len(self.names)), dtype=np.int64)
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, step, *values):
+        index = (self.start + self.size) % self.capacity
+        self.rows[index, 0] = step
+        self.rows[index, 1:] = values
+        if self.size < self.capacity:
+            self.size += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def clear(self):
+        self.start = 0
+        self.size = 0
+
+    def array(self):
+        """Returns a copy of the stored rows, oldest first."""
+        end = self.start + self.size
+        if end <= self.capacity:
+            return self.rows[self.start:end].copy()
+        return np.concatenate((self.rows[self.start:], self.rows[:end - self.capacity]))
+
+    def downsample(self, max_points=1000):
+        """
+        Returns {name: (steps, values)} with at most max_points points per series.
+        Rows are cut into max_points // 2 buckets and each bucket keeps its minimum and its
+        maximum in chronological order, so peaks and drops stay visible on the plot.
+        """
+        rows = self.array()
+        steps = rows[:, 0]
+        nb_buckets = max(max_points // 2, 1)
+        if len(rows) <= max_points:
+            return {name: (steps, rows[:, 1 + i]) for i, name in enumerate(self.names)}
+
+        bucket_length = -(-len(rows) // nb_buckets)
+        nb_buckets = -(-len(rows) // bucket_length)
+        padding = nb_buckets * bucket_length - len(rows)
+        # Repeating the last row does not change the min/max of the last bucket
+        padded = np.pad(rows[:, 1:], ((0, padding), (0, 0)), mode="edge")
+        buckets = padded.reshape(nb_buckets, bucket_length, len(self.names))
+        offsets = (np.arange(nb_buckets) * bucket_length)[:, None]
+        first_index = np.minimum(buckets.argmin(axis=1), buckets.argmax(axis=1)) + offsets
+        last_index = np.maximum(buckets.argmin(axis=1), buckets.argmax(axis=1)) + offsets
+
+        series = {}
+        for i, name in enumerate(self.names):
+            indices = np.stack((first_index[:, i], last_index[:, i]), axis=1).ravel()
+            indices = np.minimum(indices, len(rows) - 1)
+            series[name] = (steps[indices], rows[indices, 1 + i])
+        return series
@@ -0,0 +1,142 @@
+"""
+-------------------------------------------------
+Group 1 - Project Name
+Created on: 2025-03-11
+Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
+-------------------------------------------------
+
+Description:
+This script contains the pickup job queue of the model: every transformation
+posts a job for the robots of the next colour, and once per step the open
+jobs are assigned to the closest available robots.
+"""
+
+from events import INFO, agent_label
+from messages import PICK_UP_WASTE
+
+
+class PickupJob:
+    """A waste lying at `location` waiting for a robot of `robot_class`."""
+    __slots__ = ("job_id", "waste", "robot_class", "location", "posted_step", "robot", "assigned_step", "deadline",
+                 "excluded_robot", "excluded_until")
+
+    def __init__(self, job_id, waste, robot_class, location, posted_step):
+        self.job_id = job_id
+        self.waste = waste
+        self.robot_class = robot_class
+        self.location = location
+        self.posted_step = posted_step
+        self.robot = None
+        self.assigned_step = None
+        self.deadline = None
+        # Robot that let the job go stale, not given the job again before excluded_until
+        self.excluded_robot = None
+        self.excluded_until = None
+
+
+class JobQueue:
+    """
+    Open pickup jobs of the model, keyed by the unique_id of their waste.
+    `assign` matches, oldest job first, every unassigned job with the closest robot of its class
+    that is free (no target, no other job, room to carry). A job goes back to the queue when its
+    robot has not reached it `stale_margin` steps after the travel time, or got another target;
+    that robot (often stuck behind another one) is then not given the job again for `stale_margin` steps.
+    """
+
+    def __init__(self, model, stale_margin=10):
+        self.model = model
+        self.stale_margin = stale_margin
+        self.jobs = {}
+        # robot -> job it is heading to
+        self.assignments = {}
+        self.next_job_id = 0
+        self.posted = 0
+        self.completed = 0
+        self.reassigned = 0
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def post(self, waste, robot_class, location):
+        self.next_job_id += 1
+        self.jobs[waste.unique_id] = PickupJob(self.next_job_id, waste, robot_class, location, self.model.schedule.steps)
+        self.posted += 1
+
+    def complete(self, waste):
+        """Closes the job of a waste that has just been collected (by any robot)."""
+        job = self.jobs.pop(waste.unique_id, None)
+        if job is None:
+            return
+        self.completed += 1
+        if job.robot is not None:
+            self.release(job)
+
+    def release(self, job):
+        robot = job.robot
+        del self.assignments[robot]
+        if robot.knowledge.target_location == job.location:
+            robot.knowledge.target_location = None
+        job.robot = None
+
+    def is_available(self, robot):
+        knowledge = robot.knowledge
+        return (robot not in self.assignments and knowledge.target_location is None
+                and len(knowledge.collected_waste) < robot.capacity)
+
+    def assign(self):
+        """Reopens stale jobs, then assigns the open ones; returns the number of assignments."""
+        if not self.jobs:
+            return 0
+        model = self.model
+        step = model.schedule.steps
+        for job in self.jobs.values():
+            if job.robot is None or job.robot.pos == job.location:
+                continue
+            if step > job.deadline or job.robot.knowledge.target_location != job.location:
+                job.excluded_robot = job.robot
+                job.excluded_until = step + self.stale_margin
+                self.release(job)
+                self.reassigned += 1
+
+        # Available robots of each class, computed once: when none is left, the index is not queried
+        available = {}
+        assigned = 0
+        for job in self.jobs.values():
+            if job.robot is not None:
+                continue
+            index = model.robot_index[job.robot_class]
+            candidates = available.get(job.robot_class)
+            if candidates is None:
+                candidates = available[job.robot_class] = {robot for robot in index.positions if self.is_available(robot)}
+            if not candidates:
+                continue
+            accept = candidates.__contains__
+            if job.excluded_robot is not None and step <= job.excluded_until:
+                excluded = job.excluded_robot
+                accept = lambda robot: robot is not excluded and robot in candidates
+            robot = index.nearest(job.location, accept=accept)
+            if robot is None:
+                continue
+            candidates.discard(robot)
+            distance = abs(robot.pos[0] - job.location[0]) + abs(robot.pos[1] - job.location[1])
+            job.robot = robot
+            job.assigned_step = step
+            job.deadline = step + distance + self.stale_margin
+            self.assignments[robot] = job
+            # The robot sets its target when it reads the message; until then, assignments keeps it unavailable
+            model.message_bus.send(robot, PICK_UP_WASTE, location=job.location, waste_id=job.waste.unique_id)
+            if model.events.level <= INFO:
+                model.events.record(step, INFO, "assign", "Pickup of {waste_type} waste {waste_id} at {location} assigned to {robot}",
+                                    waste_type=job.waste.waste_type, waste_id=job.waste.unique_id,
+                                    location=job.location, robot=agent_label(robot))
+            assigned += 1
+        return assigned
+
+    def stats(self):
+        return {
+            "posted": self.posted,
+            "completed": self.completed,
+            "reassigned": self.reassigned,
+            "open": len(self.jobs),
+            "assigned": len(self.assignments),
+        }
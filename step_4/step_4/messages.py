@@ -0,0 +1,101 @@
+"""
+-------------------------------------------------
+Group 1 - Project Name
+Created on: 2025-03-11
+Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
+-------------------------------------------------
+
+Description:
+This script contains the messages exchanged by the robots and the message bus
+of the model, which delivers them once per step into the robots' inboxes.
+"""
+
+from events import INFO, agent_label
+
+PICK_UP_WASTE = "pick_up_waste"
+
+
+class Message:
+    """A typed message; `location` and `waste_id` are only set by the kinds that need them."""
+    __slots__ = ("kind", "sender", "location", "waste_id", "step")
+
+    def __init__(self, kind, sender=None, location=None, waste_id=None, step=None):
+        self.kind = kind
+        self.sender = sender
+        self.location = location
+        self.waste_id = waste_id
+        self.step = step
+
+    def __repr__(self):
+        return f"Message({self.kind}, location={self.location}, waste_id={self.waste_id})"
+
+
+class MessageBus:
+    """
+    Collects the messages sent during a step and delivers them all at once, at the start of the
+    next step, into `recipient.knowledge.inbox`.
+    Pending pick_up_waste notices for the same recipient and location are merged into one.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        # (recipient, kind, location) -> Message, in sending order
+        self.pending = {}
+        self.sent = 0
+        self.coalesced = 0
+        self.delivered = 0
+        self.broadcasts = 0
+
+    def __len__(self):
+        return len(self.pending)
+
+    def send(self, recipient, kind, sender=None, location=None, waste_id=None):
+        """Queues a message for the next delivery; returns False if it was merged into a pending one."""
+        self.sent += 1
+        key = (recipient.unique_id, kind, location)
+        if kind == PICK_UP_WASTE and key in self.pending:
+            self.coalesced += 1
+            return False
+        model = self.model
+        message = Message(kind, sender, location, waste_id, model.schedule.steps)
+        self.pending[key] = (recipient, message)
+        if model.events.level <= INFO:
+            model.events.record(model.schedule.steps, INFO, "message", "Message {message_kind} sent to {recipient} (location {location})",
+                                message_kind=kind, recipient=agent_label(recipient), location=location)
+        return True
+
+    def broadcast(self, recipient_class, kind, sender=None, location=None, waste_id=None, radius=None, origin=None):
+        """
+        Sends the message to every robot of recipient_class, or only to those within `radius`
+        (Manhattan distance) of `origin` (default: the location). Returns the number of recipients.
+        """
+        self.broadcasts += 1
+        index = self.model.robot_index[recipient_class]
+        if radius is None:
+            recipients = list(index.positions)
+        else:
+            recipients = index.within(origin if origin is not None else location, radius)
+        for recipient in recipients:
+            if recipient is not sender:
+                self.send(recipient, kind, sender, location, waste_id)
+        return len(recipients)
+
+    def deliver(self):
+        """Moves every pending message into its recipient's inbox; returns the number delivered."""
+        if not self.pending:
+            return 0
+        pending = self.pending
+        self.pending = {}
+        for recipient, message in pending.values():
+            recipient.knowledge.inbox.append(message)
+        self.delivered += len(pending)
+        return len(pending)
+
+    def stats(self):
+        return {
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "delivered": self.delivered,
+            "broadcasts": self.broadcasts,
+            "pending": len(self.pending),
+        }
@@ -12,17 +12,44 @@ and now also handles communication between robots.
 
 from mesa import Model, DataCollector
 from mesa.space import MultiGrid
-import random as py_random
+import time
+import numpy as np
 from agents import GreenRobot, YellowRobot, RedRobot  
-from objects import Waste, WasteDisposalZone, Radioactivity 
+from objects import Waste, WasteDisposalZone, build_zone_layers, RADIOACTIVITY_RANGES
 from schedule import RandomActivationScheduler
+from events import EventLog, DEBUG, INFO, agent_label
+from spatial import BucketIndex
+from profiling import PhaseProfiler
+from messages import MessageBus
+from jobs import JobQueue
+from navigation import distance_field, neighbor_masks, decode_neighbors
+from coverage import CoveragePyramid
+from stopping import StopConditions
+from accounting import WasteAccounting
+import snapshot
 
-class RobotMission(Model):
-    def __init__(self, width, height, initial_green_waste, initial_yellow_waste, initial_red_waste, nb_yellow_agent, nb_green_agent, nb_red_agent):
-        super().__init__() 
-        self.random = py_random.Random()
+# Highest zone id each robot type is allowed to enter
+MAX_ZONE = {GreenRobot: 1, YellowRobot: 2, RedRobot: 3}
+
+class RobotMission(WasteAccounting, Model):
+    def __init__(self, width, height, initial_green_waste, initial_yellow_waste, initial_red_waste, nb_yellow_agent, nb_green_agent, nb_red_agent, log_level=INFO, log_capacity=1000, seed=None, profile=False,
+                 stop_when_finished=True, kpi_fraction=None, stall_steps=None, populate=True):
+        # La graine pilote self.random (ordre du scheduler, placements, déplacements) et self.rng (radioactivité, oubli de la carte)
+        super().__init__(seed=seed)
+        self.seed = seed
         self.grid = MultiGrid(width, height, False)
         self.schedule = RandomActivationScheduler(self)
+        self.current_id = 0
+        # Journal des événements (log_level=None pour les runs sans affichage)
+        self.events = EventLog(log_level, log_capacity)
+        # Profilage optionnel des phases percepts / deliberate / do (voir profiling.py)
+        self.profiler = PhaseProfiler() if profile else None
+        # Messages envoyés pendant un pas, distribués au début du pas suivant
+        self.message_bus = MessageBus(self)
+        # Déchets transformés en attente d'un robot de la couleur suivante
+        self.jobs = JobQueue(self)
+        # Conditions d'arrêt vérifiées après chaque pas (self.running passe à False)
+        self.stop_conditions = StopConditions(stop_when_finished, kpi_fraction, stall_steps)
         self.initial_green_waste = initial_green_waste
         self.initial_yellow_waste = initial_yellow_waste
         self.initial_red_waste = initial_red_waste
@@ -30,33 +57,37 @@ class RobotMission(Model):
         self.nb_green_agent = nb_green_agent
         self.nb_red_agent = nb_red_agent
 
-        self.explored_map = {}
-        for x in range(self.grid.width):
-            for y in range(self.grid.height):
-                self.explored_map[(x, y)] = False
-        
+        # Carte collective des cellules explorées, indexée par [x, y]
+        self.explored_map = np.zeros((width, height), dtype=bool)
         self.pheromone_decay_rate = 0.1 
 
-        l = self.grid.width // 3
-        for x in range(self.grid.width):
-            for y in range(self.grid.height):
-                if x < l:
-                    zone = "z1"
-                elif x < 2 * l:
-                    zone = "z2"
-                else:
-                    zone = "z3"
-                radioactivity_agent = Radioactivity(self.schedule.get_agent_count(), self, zone)
-                self.grid.place_agent(radioactivity_agent, (x, y))
-                self.schedule.add(radioactivity_agent)
-                
-        z_width = l
-        height = self.grid.height
-        self.datacollector = DataCollector({
-            "Waste": lambda m: m.schedule.get_type_count(Waste),
-        })
+        self.zone_map, self.radioactivity_map = build_zone_layers(width, height, self.rng)
+        self.neighbor_masks = self.build_neighbor_masks()
+        # Red robots may go everywhere: their masks hold the full von Neumann neighbourhoods
+        self.neighborhoods = self.neighbor_masks[RedRobot]
+        # Frontière d'exploration : cellules non explorées voisines d'une cellule explorée, indexées par zone
+        self.frontier_map = np.zeros((width, height), dtype=bool)
+        self.frontier_index = {zone: BucketIndex(width, height) for zone in RADIOACTIVITY_RANGES}
+        # Unexplored cells per tile and per zone (explored_map must only be modified in place)
+        self.coverage = CoveragePyramid(self.zone_map, self.explored_map)
+        # Positions of the robots of each type, kept up to date by move_robot
+        self.robot_index = {robot_type: BucketIndex(width, height) for robot_type in MAX_ZONE}
+        # Distances to the disposal column of each robot type, computed on first use
+        self.disposal_fields = {}
+
+        # Compteurs de déchets tenus à jour par place_waste_in_zone et perform_action
+        self.init_waste_counts(initial_green_waste, initial_yellow_waste, initial_red_waste)
+        self.datacollector = DataCollector(self.waste_reporters())
+
+        # populate=False leaves the grid empty (used by load_snapshot)
+        if populate:
+            self.populate()
 
- 
+    def populate(self):
+        "Places the robots, the initial wastes and the disposal zones."
+        width = self.grid.width
+        height = self.grid.height
+        z_width = width // 3
 
         def find_empty_cell(x_start, x_end, height, grid):
             while True:
@@ -68,63 +99,205 @@ class RobotMission(Model):
 
         for _ in range(self.nb_green_agent):
             x, y = find_empty_cell(0, z_width - 1, height, self.grid)
-            robot = GreenRobot(self.schedule.get_agent_count(), self)
+            robot = GreenRobot(self.next_id(), self)
             self.schedule.add(robot)
             self.grid.place_agent(robot, (x, y))
+            self.robot_index[GreenRobot].add(robot, (x, y))
 
         for _ in range(self.nb_yellow_agent):
             x, y = find_empty_cell(0, 2 * z_width - 1, height, self.grid)
-            robot = YellowRobot(self.schedule.get_agent_count(), self)
+            robot = YellowRobot(self.next_id(), self)
             self.schedule.add(robot)
             self.grid.place_agent(robot, (x, y))
+            self.robot_index[YellowRobot].add(robot, (x, y))
 
         for _ in range(self.nb_red_agent):
             x, y = find_empty_cell(0, self.grid.width - 1, height, self.grid)
-            robot = RedRobot(self.schedule.get_agent_count(), self)
+            robot = RedRobot(self.next_id(), self)
             self.schedule.add(robot)
             self.grid.place_agent(robot, (x, y))
+            self.robot_index[RedRobot].add(robot, (x, y))
             
-        for _ in range(initial_green_waste):
+        for _ in range(self.initial_green_waste):
             self.place_waste_in_zone("green", 0, z_width - 1, height)
-        for _ in range(initial_yellow_waste):
+        for _ in range(self.initial_yellow_waste):
             self.place_waste_in_zone("yellow", z_width, 2 * z_width - 1, height)
-        for _ in range(initial_red_waste):
+        for _ in range(self.initial_red_waste):
             self.place_waste_in_zone("red", 2 * z_width, width - 1, height)
             
         for y in range(height):
             dz1_pos = (z_width - 1, y)
-            dz1_agent = WasteDisposalZone(self.schedule.get_agent_count(), self)
+            dz1_agent = WasteDisposalZone(self.next_id(), self)
             self.grid.place_agent(dz1_agent, dz1_pos)
             self.schedule.add(dz1_agent)
 
             dz2_pos = (2 * z_width - 1, y)
-            dz2_agent = WasteDisposalZone(self.schedule.get_agent_count(), self)
+            dz2_agent = WasteDisposalZone(self.next_id(), self)
             self.grid.place_agent(dz2_agent, dz2_pos)
             self.schedule.add(dz2_agent)
 
             dz3_pos = (self.grid.width - 1, y)
-            dz3_agent = WasteDisposalZone(self.schedule.get_agent_count(), self)
+            dz3_agent = WasteDisposalZone(self.next_id(), self)
             self.grid.place_agent(dz3_agent, dz3_pos)
             self.schedule.add(dz3_agent)
     
+    def save_snapshot(self, path, compressed=True):
+        "Saves the state of the run to a .npz file (see snapshot.py)."
+        snapshot.save_snapshot(self, path, compressed)
+
+    @classmethod
+    def load_snapshot(cls, path, log_level=INFO, log_capacity=1000, profile=False):
+        "Rebuilds a run saved by save_snapshot; stepping it gives the same results as the original run."
+        return snapshot.load_snapshot(path, cls, log_level, log_capacity, profile)
+
+    def build_neighbor_masks(self):
+        """Precomputes, for each robot type, a (width, height) uint8 mask of its allowed von Neumann moves (see navigation.py)."""
+        return {robot_type: neighbor_masks(self.zone_map <= max_zone) for robot_type, max_zone in MAX_ZONE.items()}
+
+    def allowed_neighbors(self, robot_type, pos):
+        "Cells a robot of robot_type may move to from pos, in the order of grid.get_neighborhood."
+        return decode_neighbors(self.neighbor_masks[robot_type], pos)
+
     def reset_old_explorations(self):
         "Réinitialise périodiquement certaines cellules explorées pour permettre la redécouverte."
-        if self.schedule.steps % 30 == 0:  
-            for pos in list(self.explored_map.keys()):                    
-                if self.explored_map[pos] and self.random.random() < self.pheromone_decay_rate:
-                    self.explored_map[pos] = False
+        if self.schedule.steps % 30 == 0:
+            forgotten = self.rng.random(self.explored_map.shape) < self.pheromone_decay_rate
+            self.explored_map &= ~forgotten
+            self.refresh_frontier()
+            self.coverage.refresh()
+
+    def has_full_loads(self):
+        "True while a robot holds a full load, i.e. can still transform or dispose of wastes."
+        return any(len(robot.knowledge.collected_waste) >= robot.capacity
+                   for index in self.robot_index.values() for robot in index.positions)
+
+    def mark_explored(self, pos):
+        "Marks a cell as explored and moves the exploration frontier past it."
+        explored_map = self.explored_map
+        if explored_map[pos]:
+            return
+        explored_map[pos] = True
+        self.coverage.mark_explored(pos)
+        frontier_map = self.frontier_map
+        if frontier_map[pos]:
+            frontier_map[pos] = False
+            self.frontier_index[int(self.zone_map[pos])].remove(pos)
+        for neighbor in decode_neighbors(self.neighborhoods, pos):
+            if not explored_map[neighbor] and not frontier_map[neighbor]:
+                frontier_map[neighbor] = True
+                self.frontier_index[int(self.zone_map[neighbor])].add(neighbor, neighbor)
+
+    def refresh_frontier(self):
+        "Recomputes the frontier from the explored map (after cells were forgotten) and updates the changed cells only."
+        explored = self.explored_map
+        near_explored = np.zeros_like(explored)
+        near_explored[1:] |= explored[:-1]
+        near_explored[:-1] |= explored[1:]
+        near_explored[:, 1:] |= explored[:, :-1]
+        near_explored[:, :-1] |= explored[:, 1:]
+        frontier = near_explored & ~explored
+        for x, y in np.argwhere(frontier & ~self.frontier_map).tolist():
+            self.frontier_index[int(self.zone_map[x, y])].add((x, y), (x, y))
+        for x, y in np.argwhere(self.frontier_map & ~frontier).tolist():
+            self.frontier_index[int(self.zone_map[x, y])].remove((x, y))
+        self.frontier_map = frontier
+
+    def nearest_frontier(self, pos, robot_type):
+        "Closest frontier cell that robot_type may enter, or None."
+        best_cell = None
+        best_distance = None
+        for zone in range(1, MAX_ZONE[robot_type] + 1):
+            cell = self.frontier_index[zone].nearest(pos)
+            if cell is None:
+                continue
+            distance = abs(cell[0] - pos[0]) + abs(cell[1] - pos[1])
+            if best_distance is None or distance < best_distance:
+                best_cell = cell
+                best_distance = distance
+        return best_cell
+
+    def move_towards_frontier(self, robot):
+        "Moves robot one step closer to its nearest frontier cell; returns False if there is none or the way is blocked."
+        knowledge = robot.knowledge
+        frontier = knowledge.frontier_target
+        # The target is kept while it is still on the frontier, so the index is only queried again once it is reached
+        if frontier is None or not self.frontier_map[frontier]:
+            frontier = self.nearest_frontier(robot.pos, type(robot))
+            if frontier is None:
+                # No frontier in reach (e.g. none of its zones explored yet): head to the nearest unexplored cell
+                frontier = self.coverage.nearest_unexplored(robot.pos, MAX_ZONE[type(robot)])
+            knowledge.frontier_target = frontier
+            if frontier is None:
+                return False
+        fx, fy = frontier
+        distance = abs(fx - robot.pos[0]) + abs(fy - robot.pos[1])
+        candidates = []
+        for position in self.allowed_neighbors(type(robot), robot.pos):
+            if abs(fx - position[0]) + abs(fy - position[1]) >= distance:
+                continue
+            contents = self.grid.get_cell_list_contents(position)
+            if not any(isinstance(c, (GreenRobot, YellowRobot, RedRobot)) for c in contents):
+                candidates.append(position)
+        if not candidates:
+            return False
+        new_position = candidates[0] if len(candidates) == 1 else self.random.choice(candidates)
+        self.move_robot(robot, new_position)
+        return True
 
     def step(self):
+        profiler = self.profiler
+        if profiler is None:
+            self.jobs.assign()
+            self.message_bus.deliver()
+            self.schedule.step()
+            self.datacollector.collect(self)
+            self.reset_old_explorations()
+            if self.stop_conditions.update(self):
+                self.running = False
+            return
+        clock = time.perf_counter
+        start = clock()
+        self.jobs.assign()
+        end = clock()
+        profiler.add("RobotMission", "assign_jobs", end - start)
+        start = end
+        self.message_bus.deliver()
+        profiler.add("RobotMission", "deliver_messages", clock() - start)
+        start = clock()
         self.schedule.step()
+        end = clock()
+        profiler.add("RobotMission", "schedule", end - start)
         self.datacollector.collect(self)
+        start = clock()
+        profiler.add("RobotMission", "datacollector", start - end)
         self.reset_old_explorations()
+        profiler.add("RobotMission", "reset_old_explorations", clock() - start)
+        profiler.end_step(self.schedule.steps)
+        if self.stop_conditions.update(self):
+            self.running = False
+
+    def next_id(self):
+        "Returns a fresh unique_id (the agent count cannot be reused once wastes are removed)."
+        self.current_id += 1
+        return self.current_id
+
+    def update_waste_counts(self, waste_type, old_state, new_state, pos=None):
+        "Moves one waste between two states; pos is the cell it leaves or lands on when one state is 'ground'."
+        if old_state is not None:
+            self.waste_counts[old_state][waste_type] -= 1
+        if new_state is not None:
+            self.waste_counts[new_state][waste_type] += 1
+        if pos is not None:
+            delta = 1 if new_state == "ground" else -1
+            self.ground_waste_by_zone[int(self.zone_map[pos])][waste_type] += delta
 
     def place_waste_in_zone(self, waste_type, x_start, x_end, height):
-        waste = Waste(self.schedule.get_agent_count(), self, waste_type=waste_type)
+        waste = Waste(self.next_id(), self, waste_type=waste_type)
         while True:
             pos = (self.random.randrange(x_start, x_end), self.random.randrange(height))
             self.grid.place_agent(waste, pos)
             self.schedule.add(waste)
+            self.update_waste_counts(waste_type, None, "ground", pos)
             break
 
     def perform_action(self, agent, action):
@@ -132,110 +305,137 @@ class RobotMission(Model):
             contents = self.grid.get_cell_list_contents(agent.pos)
             target_waste_type = "green" if isinstance(agent, GreenRobot) else ("yellow" if isinstance(agent, YellowRobot) else "red")
             for content in contents:
-                if isinstance(content, Waste) and content.waste_type == target_waste_type and len(agent.knowledge["collected_waste"]) < 2:
-                    agent.knowledge["collected_waste"].append(content)
+                if isinstance(content, Waste) and content.waste_type == target_waste_type and len(agent.knowledge.collected_waste) < 2:
+                    agent.knowledge.collected_waste.append(content)
                     self.grid.remove_agent(content)
                     self.schedule.remove(content)
-                    print(f"{agent} collected {content}")
+                    self.jobs.complete(content)
+                    self.update_waste_counts(content.waste_type, "ground", "carried", agent.pos)
+                    if self.events.level <= INFO:
+                        self.events.record(self.schedule.steps, INFO, "collect", "{robot} collected {waste_type} waste {waste_id}",
+                                           robot=agent_label(agent), waste_type=content.waste_type, waste_id=content.unique_id)
                     break  
         elif action == "transform_waste":
             # For GreenRobot: transform two green wastes into yellow waste and notify a YellowRobot.
-            if isinstance(agent, GreenRobot) and len(agent.knowledge["collected_waste"]) == 2:
-                agent.knowledge["collected_waste"].clear()
-                yellow_waste = Waste(self.schedule.get_agent_count(), self, waste_type="yellow")
+            if isinstance(agent, GreenRobot) and len(agent.knowledge.collected_waste) == 2:
+                for waste in agent.knowledge.collected_waste:
+                    self.update_waste_counts(waste.waste_type, "carried", "transformed")
+                agent.knowledge.collected_waste.clear()
+                yellow_waste = Waste(self.next_id(), self, waste_type="yellow")
                 self.grid.place_agent(yellow_waste, agent.pos)
                 self.schedule.add(yellow_waste)
-                print(f"{agent} transformed green waste into yellow waste: {yellow_waste}")
-                closest_yellow = self.get_closest_agent(agent.pos, YellowRobot)
-                if closest_yellow is not None:
-                    message = {"type": "pick_up_waste", "waste_id": yellow_waste.unique_id, "location": agent.pos}
-                    self.send_message(closest_yellow, message)
+                self.update_waste_counts("yellow", None, "ground", agent.pos)
+                if self.events.level <= INFO:
+                    self.events.record(self.schedule.steps, INFO, "transform", "{robot} transformed green waste into yellow waste {waste_id}",
+                                       robot=agent_label(agent), waste_id=yellow_waste.unique_id)
+                self.jobs.post(yellow_waste, YellowRobot, agent.pos)
             # For YellowRobot: transform two yellow wastes into red waste and notify a RedRobot.
-            if isinstance(agent, YellowRobot) and len(agent.knowledge["collected_waste"]) == 2:
-                agent.knowledge["collected_waste"].clear()
-                red_waste = Waste(self.schedule.get_agent_count(), self, waste_type="red")
+            if isinstance(agent, YellowRobot) and len(agent.knowledge.collected_waste) == 2:
+                for waste in agent.knowledge.collected_waste:
+                    self.update_waste_counts(waste.waste_type, "carried", "transformed")
+                agent.knowledge.collected_waste.clear()
+                red_waste = Waste(self.next_id(), self, waste_type="red")
                 self.grid.place_agent(red_waste, agent.pos)
                 self.schedule.add(red_waste)
-                print(f"{agent} transformed yellow waste into red waste: {red_waste}")
-                closest_red = self.get_closest_agent(agent.pos, RedRobot)
-                if closest_red is not None:
-                    message = {"type": "pick_up_waste", "waste_id": red_waste.unique_id, "location": agent.pos}
-                    self.send_message(closest_red, message)
+                self.update_waste_counts("red", None, "ground", agent.pos)
+                if self.events.level <= INFO:
+                    self.events.record(self.schedule.steps, INFO, "transform", "{robot} transformed yellow waste into red waste {waste_id}",
+                                       robot=agent_label(agent), waste_id=red_waste.unique_id)
+                self.jobs.post(red_waste, RedRobot, agent.pos)
         elif action == "dispose_waste":
             if not self.is_in_disposal_zone(agent):
                 self.move_agent_towards_disposal_zone(agent)
             else:
                 if isinstance(agent, GreenRobot):
-                    for waste in agent.knowledge["collected_waste"]:
+                    for waste in agent.knowledge.collected_waste:
                         self.grid.place_agent(waste, agent.pos)
-                        agent.knowledge["collected_waste"].clear()
-                        print(f"{agent} disposed yellow waste")
+                        self.update_waste_counts(waste.waste_type, "carried", "ground", agent.pos)
+                        agent.knowledge.collected_waste.clear()
+                        if self.events.level <= INFO:
+                            self.events.record(self.schedule.steps, INFO, "dispose", "{robot} disposed yellow waste", robot=agent_label(agent))
                 elif isinstance(agent, YellowRobot): 
-                    for waste in agent.knowledge["collected_waste"]:
+                    for waste in agent.knowledge.collected_waste:
                         self.grid.place_agent(waste, agent.pos)
-                        agent.knowledge["collected_waste"].clear()
-                        print(f"{agent} disposed red waste")
+                        self.update_waste_counts(waste.waste_type, "carried", "ground", agent.pos)
+                        agent.knowledge.collected_waste.clear()
+                        if self.events.level <= INFO:
+                            self.events.record(self.schedule.steps, INFO, "dispose", "{robot} disposed red waste", robot=agent_label(agent))
                 elif isinstance(agent, RedRobot):
-                    agent.knowledge["collected_waste"].clear()
-                    print(f"{agent} disposed red waste")
+                    for waste in agent.knowledge.collected_waste:
+                        self.update_waste_counts(waste.waste_type, "carried", "disposed")
+                    agent.knowledge.collected_waste.clear()
+                    if self.events.level <= INFO:
+                        self.events.record(self.schedule.steps, INFO, "dispose", "{robot} disposed red waste", robot=agent_label(agent))
 
-    def is_in_disposal_zone(self, agent):
+    def disposal_column(self, robot_type):
         z_width = self.grid.width // 3
-        if isinstance(agent, GreenRobot):
-            dx = z_width - 1
-        elif isinstance(agent, YellowRobot):
-            dx = 2 * z_width - 1
-        elif isinstance(agent, RedRobot):
-            dx = self.grid.width - 1
-        return agent.pos[0] == dx
+        if robot_type is GreenRobot:
+            return z_width - 1
+        elif robot_type is YellowRobot:
+            return 2 * z_width - 1
+        return self.grid.width - 1
+
+    def is_in_disposal_zone(self, agent):
+        return agent.pos[0] == self.disposal_column(type(agent))
+
+    def disposal_distance_field(self, robot_type):
+        """
+        Moves from every cell to the disposal column of robot_type (-1 where it cannot go).
+        Zones and disposal columns never change during a run, so each field is computed once, on first use.
+        """
+        field = self.disposal_fields.get(robot_type)
+        if field is None:
+            dx = self.disposal_column(robot_type)
+            targets = [(dx, y) for y in range(self.grid.height)]
+            field = distance_field(self.neighbor_masks[robot_type], targets)
+            self.disposal_fields[robot_type] = field
+        return field
 
     def move_robot(self, robot, new_position):
         if not self.is_position_allowed(robot, new_position):
+            if self.events.level <= DEBUG:
+                self.events.record(self.schedule.steps, DEBUG, "blocked", "Move not allowed for {robot} to {position}",
+                                   robot=agent_label(robot), position=new_position)
             return
         contents = self.grid.get_cell_list_contents(new_position)
         if any(isinstance(c, (GreenRobot, YellowRobot, RedRobot)) for c in contents):
+            if self.events.level <= DEBUG:
+                self.events.record(self.schedule.steps, DEBUG, "blocked", "Cell {position} is occupied, {robot} stays",
+                                   robot=agent_label(robot), position=new_position)
             return
         self.grid.move_agent(robot, new_position)
+        self.robot_index[type(robot)].move(robot, new_position)
 
     def is_position_allowed(self, robot, position):
-        contents = self.grid.get_cell_list_contents(position)
-        radioactivity_agents = [agent for agent in contents if hasattr(agent, "zone")]
-        if not radioactivity_agents:
-            return False
-        zone = radioactivity_agents[0].zone      
-        if isinstance(robot, GreenRobot) and zone == "z1":
-            return True
-        elif isinstance(robot, YellowRobot) and (zone == "z1" or zone == "z2"):
-            return True
-        elif isinstance(robot, RedRobot):
-            return True        
-        return False
-    
+        return bool(self.zone_map[position] <= MAX_ZONE[type(robot)])
+
     def move_agent_towards_disposal_zone(self, agent):
-        x, y = agent.pos
-        z_width = self.grid.width // 3
-        if isinstance(agent, GreenRobot):
-            dx = z_width - 1
-        elif isinstance(agent, YellowRobot):
-            dx = 2 * z_width - 1
-        elif isinstance(agent, RedRobot):
-            dx = self.grid.width - 1
-        if x < dx:
-            new_x = x + 1
-        elif x > dx:
-            new_x = x - 1
-        else:
-            new_x = x
-        new_y = y
-        new_position = (new_x, new_y)
-        if self.is_position_allowed(agent, new_position):
-            contents = self.grid.get_cell_list_contents(new_position)
-            if not any(isinstance(c, (GreenRobot, YellowRobot, RedRobot)) for c in contents):
-                self.grid.move_agent(agent, new_position)
+        "Descends the distance field of the robot towards its disposal column, sidestepping robots in the way."
+        field = self.disposal_distance_field(type(agent))
+        distance = field[agent.pos]
+        closer = []
+        aside = []
+        for position in self.allowed_neighbors(type(agent), agent.pos):
+            contents = self.grid.get_cell_list_contents(position)
+            if any(isinstance(c, (GreenRobot, YellowRobot, RedRobot)) for c in contents):
+                continue
+            if field[position] < distance:
+                closer.append(position)
+            elif field[position] == distance:
+                aside.append(position)
+        # Un pas de côté quand toutes les cellules plus proches sont occupées
+        candidates = closer or aside
+        if not candidates:
+            return
+        new_position = candidates[0] if len(candidates) == 1 else self.random.choice(candidates)
+        self.grid.move_agent(agent, new_position)
+        self.robot_index[type(agent)].move(agent, new_position)
 
     # --- New communication helper methods ---
 
     def get_closest_agent(self, pos, agent_class):
+        if agent_class in self.robot_index:
+            return self.robot_index[agent_class].nearest(pos)
         min_distance = None
         closest_agent = None
         for agent in self.schedule.agents:
@@ -245,8 +445,3 @@ class RobotMission(Model):
                     min_distance = distance
                     closest_agent = agent
         return closest_agent
-
-    def send_message(self, recipient, message):
-        if hasattr(recipient, "inbox"):
-            recipient.inbox.append(message)
-            print(f"Message sent to agent {recipient.unique_id}: {message}")
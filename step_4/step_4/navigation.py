@@ -0,0 +1,72 @@
+"""
+-------------------------------------------------
+Group 1 - Project Name
+Created on: 2025-03-11
+Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
+-------------------------------------------------
+
+Description:
+This script contains the neighbour masks of the grid (one bit per allowed
+von Neumann move of every cell) and the breadth-first distance fields used
+by the robots to reach their disposal column along the shortest allowed path.
+"""
+
+import numpy as np
+
+# Von Neumann moves, in the order of grid.get_neighborhood(moore=False, include_center=False); bit i is OFFSETS[i]
+OFFSETS = ((-1, 0), (0, -1), (0, 1), (1, 0))
+# Moves encoded by each of the 16 masks
+MASK_OFFSETS = tuple(tuple(offset for bit, offset in enumerate(OFFSETS) if mask >> bit & 1) for mask in range(16))
+
+
+def neighbor_masks(allowed):
+    """
+    For a boolean map of the cells a robot may stand on (indexed by [x, y]), a uint8 array whose
+    bit i is set when the move OFFSETS[i] from the cell stays in the grid and on an allowed cell.
+    Cells that are not allowed get 0.
+    """
+    cells = allowed.astype(np.uint8)
+    masks = np.zeros(allowed.shape, dtype=np.uint8)
+    masks[1:, :] |= cells[:-1, :]
+    masks[:, 1:] |= cells[:, :-1] << 1
+    masks[:, :-1] |= cells[:, 1:] << 2
+    masks[:-1, :] |= cells[1:, :] << 3
+    masks[~allowed] = 0
+    return masks
+
+
+def decode_neighbors(masks, pos):
+    """Allowed neighbour cells of pos, in OFFSETS order."""
+    x, y = pos
+    return [(x + dx, y + dy) for dx, dy in MASK_OFFSETS[masks[x, y]]]
+
+
+def distance_field(masks, targets):
+    """
+    Number of moves from every cell to the closest target cell, following the neighbour `masks`,
+    as an int32 array indexed by [x, y]; -1 where unreachable. The search expands a whole
+    BFS level at a time with array operations.
+    """
+    field = np.full(masks.shape, -1, dtype=np.int32)
+    targets = np.asarray(targets, dtype=np.intp).reshape(-1, 2)
+    xs, ys = targets[:, 0], targets[:, 1]
+    field[xs, ys] = 0
+    distance = 0
+    while len(xs):
+        distance += 1
+        cell_masks = masks[xs, ys]
+        next_xs = []
+        next_ys = []
+        for bit, (dx, dy) in enumerate(OFFSETS):
+            moving = (cell_masks >> bit & 1).astype(bool)
+            nx = xs[moving] + dx
+            ny = ys[moving] + dy
+            # A cell reached by an earlier direction of the same level is already set
+            new = field[nx, ny] < 0
+            nx, ny = nx[new], ny[new]
+            field[nx, ny] = distance
+            next_xs.append(nx)
+            next_ys.append(ny)
+        xs = np.concatenate(next_xs)
+        ys = np.concatenate(next_ys)
+    return field
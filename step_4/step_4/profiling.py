@@ -0,0 +1,96 @@
+"""
+-------------------------------------------------
+Group 1 - Project Name
+Created on: 2025-03-11
+Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
+-------------------------------------------------
+
+Description:
+This script contains the optional profiler of the model: call counts and
+wall time per robot class and per phase (process_messages, percepts,
+deliberate, do and each action type), as a summary table and per step.
+"""
+
+from collections import defaultdict, deque
+import time
+
+
+class PhaseProfiler:
+    """
+    Times the phases of every robot step and of the model step.
+    Keys are (owner, phase) where owner is a robot class name or "RobotMission",
+    and actions executed by `do` are recorded under the phase "action:<name>".
+    The per-step series keeps the last `series_capacity` steps only, so the profiler
+    can stay on during long runs.
+    """
+
+    def __init__(self, keep_series=True, series_capacity=10_000):
+        self.calls = defaultdict(int)
+        self.seconds = defaultdict(float)
+        self.keep_series = keep_series
+        self.series = deque(maxlen=series_capacity)
+        self._current_step = defaultdict(float)
+
+    def add(self, owner, phase, elapsed):
+        key = (owner, phase)
+        self.calls[key] += 1
+        self.seconds[key] += elapsed
+        if self.keep_series:
+            self._current_step[key] += elapsed
+
+    def profile_step(self, agent):
+        """Runs the step of a robot (same phases as its step method), timing each phase."""
+        clock = time.perf_counter
+        owner = type(agent).__name__
+        if hasattr(agent, "process_messages"):
+            start = clock()
+            agent.process_messages()
+            self.add(owner, "process_messages", clock() - start)
+        start = clock()
+        agent.percepts()
+        end = clock()
+        self.add(owner, "percepts", end - start)
+        action = agent.deliberate(agent.knowledge)
+        start = clock()
+        self.add(owner, "deliberate", start - end)
+        agent.do(action)
+        elapsed = clock() - start
+        self.add(owner, "do", elapsed)
+        self.add(owner, "action:" + action, elapsed)
+
+    def end_step(self, step):
+        """Closes the current step of the per-step series."""
+        if self.keep_series:
+            row = {f"{owner}.{phase}": seconds for (owner, phase), seconds in self._current_step.items()}
+            row["step"] = step
+            self.series.append(row)
+            self._current_step = defaultdict(float)
+
+    def summary(self):
+        """Returns one row per (owner, phase), slowest first, with the share of the profiled step time."""
+        total = sum(seconds for (owner, phase), seconds in self.seconds.items() if phase == "schedule")
+        rows = []
+        for (owner, phase), seconds in self.seconds.items():
+            calls = self.calls[(owner, phase)]
+            rows.append({
+                "owner": owner,
+                "phase": phase,
+                "calls": calls,
+                "total_s": seconds,
+                "mean_us": seconds / calls * 1e6 if calls else 0.0,
+                "share_of_schedule": seconds / total if total else None,
+            })
+        rows.sort(key=lambda row: row["total_s"], reverse=True)
+        return rows
+
+    def format_summary(self):
+        lines = [f"{'owner':14} {'phase':28} {'calls':>9} {'total (s)':>10} {'mean (us)':>10}"]
+        for row in self.summary():
+            lines.append(f"{row['owner']:14} {row['phase']:28} {row['calls']:9d} {row['total_s']:10.4f} {row['mean_us']:10.2f}")
+        return "\n".join(lines)
+
+    def reset(self):
+        self.calls.clear()
+        self.seconds.clear()
+        self.series.clear()
+        self._current_step = defaultdict(float)
@@ -12,16 +12,20 @@ This script contains the frontend of the solara application
 from matplotlib.lines import Line2D
 import mesa
 import threading
+import time
 print(f"Mesa version: {mesa.__version__}")
 
 import solara
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
+from matplotlib.colors import ListedColormap
+import numpy as np
 from mesa.visualization.utils import update_counter
 
 from model import RobotMission 
 from agents import GreenRobot, YellowRobot, RedRobot
-from objects import Radioactivity, WasteDisposalZone, Waste
+from objects import WasteDisposalZone, Waste
+from history import SeriesHistory
 import os 
 import plotly.graph_objects as go
 
@@ -39,102 +43,230 @@ model = RobotMission(
 
 current_model = solara.reactive(model)
 step_count = solara.reactive(0)
-waste_history = []
-journal_logs = []
+fast_forwarding = solara.reactive(False)
+waste_history = SeriesHistory(("green", "yellow", "red"))
+JOURNAL_LENGTH = 15
+# Points drawn per series by render_lineplot, whatever the number of steps
+PLOT_POINTS = 600
+# Fraction of collected wastes targeted by "Run until 90% collected" (same KPI as batch.py)
+KPI_FRACTION = 0.9
+# Safety limit on the steps run by a single fast-forward
+FAST_FORWARD_LIMIT = 100_000
 action_stats = {"GreenRobot": 0, "YellowRobot": 0, "RedRobot": 0}
 
 
-def log_action(message):
-    journal_logs.append(f"[Step {step_count.value}] {message}")
-    if len(journal_logs) > 15:
-        journal_logs.pop(0)
+# Held while the model is stepped or read for rendering (the simulation runs in its own thread)
+simulation_lock = threading.RLock()
 
 
 def update_waste_history():
-    counts = {"green": 0, "yellow": 0, "red": 0}
-    for agent in current_model.value.schedule.agents:
-        if isinstance(agent, Waste):
-            counts[agent.waste_type] += 1
-    waste_history.append((step_count.value, counts["green"], counts["yellow"], counts["red"]))
+    model = current_model.value
+    counts = model.waste_counts["ground"]
+    waste_history.append(model.schedule.steps, counts["green"], counts["yellow"], counts["red"])
 
 
-def step_model():
-    current_model.value.step()
-    step_count.value += 1
-    update_waste_history()
+def advance_model():
+    """Steps the model once without notifying the UI; returns False (without stepping) once the model has stopped."""
+    with simulation_lock:
+        if not current_model.value.running:
+            return False
+        current_model.value.step()
+        update_waste_history()
+        return True
 
 
-def run_simulation(interval=0.1):
-    if running.value:
-        step_model()
-        threading.Timer(interval, run_simulation, [interval]).start()
+def step_model():
+    advance_model()
+    step_count.value = current_model.value.schedule.steps
+
+
+class SimulationWorker:
+    """
+    Single long-lived thread stepping the model while it is playing, as fast as
+    `max_steps_per_second` allows (0 = no limit). The UI is only notified (through
+    step_count) at most `fps` times per second; the steps in between are not rendered.
+    """
+
+    def __init__(self, fps=10, max_steps_per_second=0):
+        self.fps = fps
+        self.max_steps_per_second = max_steps_per_second
+        self.playing = False
+        self._goal = None
+        self._wake = threading.Event()
+        self._thread = None
+
+    def play(self):
+        self.playing = True
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="simulation-worker", daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def pause(self):
+        # The worker publishes the last step and goes back to sleep
+        self.playing = False
+        self._goal = None
+        fast_forwarding.value = False
+
+    def fast_forward(self, nb_steps=None, until_fraction=None, max_steps=FAST_FORWARD_LIMIT):
+        """
+        Runs nb_steps more steps, or until the collected fraction reaches until_fraction
+        (at most max_steps steps), without throttling nor rendering, then publishes a single frame.
+        """
+        last_step = current_model.value.schedule.steps + min(nb_steps or max_steps, max_steps)
+
+        def goal_reached(model):
+            if model.schedule.steps >= last_step:
+                return True
+            return until_fraction is not None and model.collected_waste_fraction() >= until_fraction
+
+        if goal_reached(current_model.value):
+            return
+        self._goal = goal_reached
+        fast_forwarding.value = True
+        self.play()
+
+    def _publish(self):
+        step_count.value = current_model.value.schedule.steps
+
+    def _loop(self):
+        last_frame = 0.0
+        while True:
+            self._wake.wait()
+            if not self.playing:
+                self._wake.clear()
+                if self.playing:
+                    # play() was called between the check and the clear
+                    self._wake.set()
+                self._publish()
+                continue
+            started = time.monotonic()
+            if not advance_model() or not current_model.value.running:
+                # A stop condition of the model triggered (see stopping.py)
+                running.value = False
+                self.pause()
+                continue
+            goal = self._goal
+            if goal is not None:
+                if goal(current_model.value):
+                    self.pause()
+                continue
+            now = time.monotonic()
+            if now - last_frame >= 1 / self.fps:
+                self._publish()
+                last_frame = now
+            if self.max_steps_per_second:
+                time.sleep(max(0.0, 1 / self.max_steps_per_second - (now - started)))
+
+
+simulation_worker = SimulationWorker(fps=10, max_steps_per_second=10)
+
+
+ROBOT_STYLES = [(GreenRobot, "green"), (YellowRobot, "yellow"), (RedRobot, "red")]
+WASTE_STYLES = [("green", "green"), ("yellow", "yellow"), ("red", "red")]
+
+
+def to_offsets(positions):
+    """Cell positions to marker centres, as the (n, 2) array expected by scatter.set_offsets."""
+    if not positions:
+        return np.empty((0, 2))
+    return np.asarray(positions, dtype=float) + 0.5
+
+
+class GridView:
+    """
+    Persistent figure of the grid. The background (zones, disposal columns, ticks, legend)
+    is drawn once per model; each refresh only moves one scatter per robot class and per
+    waste type and swaps the data of the explored-area image.
+    """
+
+    def __init__(self):
+        self.model = None
+        self.fig = None
+
+    def render(self, model, step):
+        if self.model is not model:
+            self.build(model)
+        self.update(model, step)
+        return self.fig
+
+    def build(self, model):
+        self.model = model
+        self.fig = Figure(figsize=(10, 8))
+        ax = self.ax = self.fig.add_subplot(111)
+
+        grid_width = model.grid.width
+        grid_height = model.grid.height
+        zone_width = grid_width // 3
+        ax.add_patch(plt.Rectangle((0, 0), zone_width, grid_height, color='lightgreen', alpha=0.3))
+        ax.add_patch(plt.Rectangle((zone_width, 0), zone_width, grid_height, color='lightyellow', alpha=0.3))
+        ax.add_patch(plt.Rectangle((2*zone_width, 0), zone_width, grid_height, color='lightcoral', alpha=0.3))
+
+        # Visualisation des cellules explorées : une seule image mise à jour à chaque rafraîchissement
+        self.explored_image = ax.imshow(
+            model.explored_map.T, origin='lower', extent=(0, grid_width, 0, grid_height),
+            cmap=ListedColormap(['none', 'darkgray']), vmin=0, vmax=1, alpha=0.2, interpolation='nearest', zorder=1,
+        )
 
+        disposal_positions = [agent.pos for agent in model.schedule.agents_by_type[WasteDisposalZone].values()]
+        ax.scatter(*to_offsets(disposal_positions).T, c='blue', marker='s', s=6 ** 2, zorder=2)
+        self.waste_artists = {
+            waste_type: ax.scatter([], [], c=color, marker='s', s=8 ** 2, zorder=3)
+            for waste_type, color in WASTE_STYLES
+        }
+        self.robot_artists = {
+            robot_type: ax.scatter([], [], c=color, marker='o', s=10 ** 2, zorder=4)
+            for robot_type, color in ROBOT_STYLES
+        }
+
+        ax.set_xlim(0, grid_width)
+        ax.set_ylim(0, grid_height)
+        ax.set_xticks(range(grid_width + 1))
+        ax.set_yticks(range(grid_height + 1))
+        ax.grid(True)
+        ax.set_aspect('auto')  # imshow would otherwise force square cells
+
+        legend_elements = [
+            Line2D([0], [0], marker='o', color='w', label='Green Robot', markerfacecolor='green', markersize=10),
+            Line2D([0], [0], marker='o', color='w', label='Yellow Robot', markerfacecolor='yellow', markersize=10),
+            Line2D([0], [0], marker='o', color='w', label='Red Robot', markerfacecolor='red', markersize=10),
+            Line2D([0], [0], marker='s', color='w', label='Green Waste', markerfacecolor='green', markersize=8),
+            Line2D([0], [0], marker='s', color='w', label='Yellow Waste', markerfacecolor='yellow', markersize=8),
+            Line2D([0], [0], marker='s', color='w', label='Red Waste', markerfacecolor='red', markersize=8),
+            Line2D([0], [0], marker='s', color='w', label='Waste Disposal Zone', markerfacecolor='blue', markersize=6),
+            Line2D([0], [0], marker='s', color='w', label='Explored Area', markerfacecolor='darkgray', alpha=0.5, markersize=8),
+        ]
+        ax.legend(handles=legend_elements, loc='center', bbox_to_anchor=(0.5, -0.1), ncol=4)
+
+    def update(self, model, step):
+        for robot_type, artist in self.robot_artists.items():
+            artist.set_offsets(to_offsets(list(model.robot_index[robot_type].positions.values())))
+        waste_positions = {waste_type: [] for waste_type in self.waste_artists}
+        for waste in model.schedule.agents_by_type[Waste].values():
+            waste_positions[waste.waste_type].append(waste.pos)
+        for waste_type, artist in self.waste_artists.items():
+            artist.set_offsets(to_offsets(waste_positions[waste_type]))
+        self.explored_image.set_data(model.explored_map.T)
+        self.ax.set_title(f'Robot Waste Simulation - Step {step}')
+
+
+grid_view = GridView()
 
-def render_grid():
-    fig = Figure(figsize=(10, 8))
-    ax = fig.add_subplot(111)
 
-    grid_width = current_model.value.grid.width
-    grid_height = current_model.value.grid.height
-    zone_width = grid_width // 3
-    ax.add_patch(plt.Rectangle((0, 0), zone_width, grid_height, color='lightgreen', alpha=0.3))
-    ax.add_patch(plt.Rectangle((zone_width, 0), zone_width, grid_height, color='lightyellow', alpha=0.3))
-    ax.add_patch(plt.Rectangle((2*zone_width, 0), zone_width, grid_height, color='lightcoral', alpha=0.3))
-
-    # Visualisation des cellules explorées
-    for x in range(grid_width):
-        for y in range(grid_height):
-            if current_model.value.explored_map.get((x, y), False):
-                ax.add_patch(plt.Rectangle((x, y), 1, 1, color='darkgray', alpha=0.2))
-    
-    for agent in current_model.value.schedule.agents:
-        if not hasattr(agent, 'pos') or agent.pos is None:
-            continue
-        try:
-            if isinstance(agent, GreenRobot):
-                ax.plot(agent.pos[0] + 0.5, agent.pos[1] + 0.5, 'go', markersize=10)
-            elif isinstance(agent, YellowRobot):
-                ax.plot(agent.pos[0] + 0.5, agent.pos[1] + 0.5, 'yo', markersize=10)
-            elif isinstance(agent, RedRobot):
-                ax.plot(agent.pos[0] + 0.5, agent.pos[1] + 0.5, 'ro', markersize=10)
-            elif isinstance(agent, Waste):
-                symbol = {'green': 'gs', 'yellow': 'ys', 'red': 'rs'}[agent.waste_type]
-                ax.plot(agent.pos[0] + 0.5, agent.pos[1] + 0.5, symbol, markersize=8)
-            elif isinstance(agent, WasteDisposalZone):
-                ax.plot(agent.pos[0] + 0.5, agent.pos[1] + 0.5, 'bs', markersize=6)
-        except Exception as e:
-            print(f"Error drawing agent {agent.unique_id}: {e}")
-
-    ax.set_xlim(0, grid_width)
-    ax.set_ylim(0, grid_height)
-    ax.set_xticks(range(grid_width + 1))
-    ax.set_yticks(range(grid_height + 1))
-    ax.grid(True)
-    ax.set_title(f'Robot Waste Simulation - Step {step_count.value}')
-
-    legend_elements = [
-        Line2D([0], [0], marker='o', color='w', label='Green Robot', markerfacecolor='green', markersize=10),
-        Line2D([0], [0], marker='o', color='w', label='Yellow Robot', markerfacecolor='yellow', markersize=10),
-        Line2D([0], [0], marker='o', color='w', label='Red Robot', markerfacecolor='red', markersize=10),
-        Line2D([0], [0], marker='s', color='w', label='Green Waste', markerfacecolor='green', markersize=8),
-        Line2D([0], [0], marker='s', color='w', label='Yellow Waste', markerfacecolor='yellow', markersize=8),
-        Line2D([0], [0], marker='s', color='w', label='Red Waste', markerfacecolor='red', markersize=8),
-        Line2D([0], [0], marker='s', color='w', label='Waste Disposal Zone', markerfacecolor='blue', markersize=6),
-        Line2D([0], [0], marker='s', color='w', label='Explored Area', markerfacecolor='darkgray', alpha=0.5, markersize=8),
-    ]
-
-    ax.legend(handles=legend_elements, loc='center', bbox_to_anchor=(0.5, -0.1), ncol=4)
-    return fig
+def render_grid():
+    with simulation_lock:
+        return grid_view.render(current_model.value, current_model.value.schedule.steps)
 
 
 def render_lineplot():
     fig = Figure(figsize=(6, 4))
     ax = fig.add_subplot(111)
-    if waste_history:
-        steps, greens, yellows, reds = zip(*waste_history)
-        ax.plot(steps, greens, label="Green Waste", marker='o', color='green')
-        ax.plot(steps, yellows, label="Yellow Waste", marker='o', color='gold')
-        ax.plot(steps, reds, label="Red Waste", marker='o', color='red')
+    with simulation_lock:
+        series = waste_history.downsample(PLOT_POINTS)
+    if len(series["green"][0]):
+        ax.plot(*series["green"], label="Green Waste", color='green')
+        ax.plot(*series["yellow"], label="Yellow Waste", color='gold')
+        ax.plot(*series["red"], label="Red Waste", color='red')
         ax.set_title("Waste Count over Simulation Steps")
         ax.set_xlabel("Step")
         ax.set_ylabel("Waste Count")
@@ -142,7 +274,25 @@ def render_lineplot():
     return fig
 
 
+def render_coverage():
+    fig = Figure(figsize=(6, 3))
+    ax = fig.add_subplot(111)
+    with simulation_lock:
+        coverage = current_model.value.coverage
+        fraction = coverage.explored_fraction()
+    side = coverage.tile_size
+    image = ax.imshow(fraction.T, origin='lower', cmap='Greys', vmin=0, vmax=1,
+                      extent=(0, coverage.tiles_x * side, 0, coverage.tiles_y * side))
+    ax.set_xlim(0, coverage.width)
+    ax.set_ylim(0, coverage.height)
+    ax.set_title(f"Explored share per {side}x{side} tile")
+    fig.colorbar(image, ax=ax)
+    return fig
+
+
 def render_journal():
+    with simulation_lock:
+        journal_logs = current_model.value.events.messages(JOURNAL_LENGTH)
     if not journal_logs:
         return solara.Markdown("_No activity yet._")
     return solara.Markdown("\n".join(journal_logs))
@@ -171,30 +321,37 @@ def Page():
     nb_green_agent_val = solara.reactive(2)
     nb_yellow_agent_val = solara.reactive(2)
     nb_red_agent_val = solara.reactive(2)
+    steps_per_second_val = solara.reactive(simulation_worker.max_steps_per_second)
+    fast_forward_steps_val = solara.reactive(500)
 
     def reset_model():
-        global waste_history, journal_logs, action_stats
-        current_model.value = RobotMission(
-            width=width_val.value,
-            height=height_val.value,
-            initial_green_waste=initial_green_waste_val.value,
-            initial_yellow_waste=initial_yellow_waste_val.value,
-            initial_red_waste=initial_red_waste_val.value,
-            nb_green_agent=nb_green_agent_val.value,
-            nb_yellow_agent=nb_yellow_agent_val.value,
-            nb_red_agent=nb_red_agent_val.value
-        )
+        global action_stats
+        simulation_worker.pause()
+        running.set(False)
+        with simulation_lock:
+            current_model.value = RobotMission(
+                width=width_val.value,
+                height=height_val.value,
+                initial_green_waste=initial_green_waste_val.value,
+                initial_yellow_waste=initial_yellow_waste_val.value,
+                initial_red_waste=initial_red_waste_val.value,
+                nb_green_agent=nb_green_agent_val.value,
+                nb_yellow_agent=nb_yellow_agent_val.value,
+                nb_red_agent=nb_red_agent_val.value
+            )
+            waste_history.clear()
+            for key in action_stats:
+                action_stats[key] = 0
+            update_waste_history()
         step_count.value = 0
-        waste_history = []
-        journal_logs = []
-        for key in action_stats:
-            action_stats[key] = 0
-        update_waste_history()
 
     def toggle_running():
         running.set(not running.value)
         if running.value:
-            run_simulation()
+            simulation_worker.max_steps_per_second = steps_per_second_val.value
+            simulation_worker.play()
+        else:
+            simulation_worker.pause()
 
     with solara.Column() as main:
         with solara.Sidebar():
@@ -207,13 +364,40 @@ def Page():
             solara.SliderInt("Number of Green Agents", value=nb_green_agent_val, min=1, max=3)
             solara.SliderInt("Number of Yellow Agents", value=nb_yellow_agent_val, min=1, max=3)
             solara.SliderInt("Number of Red Agents", value=nb_red_agent_val, min=1, max=3)
+            solara.SliderInt("Max steps per second (0 = unlimited)", value=steps_per_second_val, min=0, max=100,
+                             on_value=lambda value: setattr(simulation_worker, "max_steps_per_second", value))
             solara.Button("Reset", on_click=reset_model)
 
         solara.Title("Robot Waste Collection Simulation")
+        busy = running.value or fast_forwarding.value
+        # A model whose stop condition triggered is not stepped any more (see advance_model); Reset starts a new run
+        stopped = not current_model.value.running
         with solara.Row():
-            solara.Button("Step", on_click=step_model)
-            solara.Button("Stop" if running.value else "Play", on_click=toggle_running)
+            solara.Button("Step", on_click=step_model, disabled=busy or stopped)
+            solara.Button("Stop" if running.value else "Play", on_click=toggle_running,
+                          disabled=fast_forwarding.value or (stopped and not running.value))
             solara.Info(f"Step: {step_count.value}")
+            solara.Info(f"On ground: {current_model.value.count_waste('ground')} | "
+                        f"Carried: {current_model.value.count_waste('carried')} | "
+                        f"Transformed: {current_model.value.count_waste('transformed')} | "
+                        f"Disposed: {current_model.value.count_waste('disposed')}")
+            solara.Info(" | ".join(
+                f"Zone {zone}: " + ", ".join(f"{counts[waste_type]} {waste_type}" for waste_type in ("green", "yellow", "red"))
+                for zone, counts in current_model.value.ground_waste_by_zone.items()))
+            stop_reason = current_model.value.stop_conditions.reason()
+            if not current_model.value.running and stop_reason is not None:
+                solara.Success(f"Stopped: {stop_reason} (step {current_model.value.stop_conditions.triggered[stop_reason]})")
+
+        # Fast-forward: no frame is drawn until the run is over
+        with solara.Row():
+            solara.InputInt("N steps", value=fast_forward_steps_val)
+            solara.Button("Run N steps", disabled=busy or stopped,
+                          on_click=lambda: simulation_worker.fast_forward(nb_steps=max(fast_forward_steps_val.value, 1)))
+            solara.Button(f"Run until {KPI_FRACTION:.0%} collected", disabled=busy or stopped,
+                          on_click=lambda: simulation_worker.fast_forward(until_fraction=KPI_FRACTION))
+            if fast_forwarding.value:
+                solara.Button("Cancel", on_click=simulation_worker.pause)
+                solara.Info("Fast-forwarding...")
 
         with solara.Row():
             with solara.Column():
@@ -232,6 +416,10 @@ def Page():
                     solara.FigureMatplotlib(render_lineplot())
                 except Exception as e:
                     solara.Error(f"Error rendering line plot: {str(e)}")
+                try:
+                    solara.FigureMatplotlib(render_coverage())
+                except Exception as e:
+                    solara.Error(f"Error rendering coverage: {str(e)}")
 
 # To run the app:
 # solara run run.py --port 8523
\ No newline at end of file
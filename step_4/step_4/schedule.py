@@ -13,7 +13,6 @@ This script contains the schedulers
 from collections import defaultdict
 from mesa.agent import Agent
 from typing import Callable, Dict, Iterator, List, Optional, Type, Union
-import random
 
 class BaseScheduler:
     """Base scheduler class that serves as the basis for all other scheduler classes."""
@@ -79,7 +78,7 @@ class BaseScheduler:
         """Simple generator that yields an iterator of all agents."""
         agent_list = list(self._agents.values())
         if shuffled:
-            random.shuffle(agent_list)
+            self.model.random.shuffle(agent_list)
         for agent in agent_list:
             yield agent
 
@@ -97,11 +96,16 @@ class RandomActivationScheduler(BaseScheduler):
     """
     A scheduler that activates each type of agent in a random order.
     This is equivalent to RandomActivationByType from older Mesa versions.
+    Agents whose class sets `passive = True` (wastes, disposal zones) are registered
+    and counted but never stepped.
     """
     
     def __init__(self, model):
         super().__init__(model)
         self.agents_by_type = defaultdict(dict)
+        # Active agents only, kept as persistent lists shuffled in place at each step
+        self._active_types: List[Type[Agent]] = []
+        self._active_by_type: Dict[Type[Agent], List[Agent]] = {}
 
     def add(self, agent: Agent) -> None:
         """Add an Agent object to the schedule."""
@@ -111,6 +115,12 @@ class RandomActivationScheduler(BaseScheduler):
         agent_class = type(agent)
         self.agents_by_type[agent_class][agent.unique_id] = agent
 
+        if not getattr(agent, "passive", False):
+            if agent_class not in self._active_by_type:
+                self._active_by_type[agent_class] = []
+                self._active_types.append(agent_class)
+            self._active_by_type[agent_class].append(agent)
+
     def remove(self, agent: Agent) -> None:
         """Remove all instances of a given agent from the schedule."""
         super().remove(agent)
@@ -119,14 +129,21 @@ class RandomActivationScheduler(BaseScheduler):
         agent_class = type(agent)
         del self.agents_by_type[agent_class][agent.unique_id]
 
+        if not getattr(agent, "passive", False):
+            self._active_by_type[agent_class].remove(agent)
+
+    @property
+    def active_agents(self) -> List[Agent]:
+        """Return a list of the agents that are stepped."""
+        return [agent for agent_type in self._active_types for agent in self._active_by_type[agent_type]]
+
     def step(self) -> None:
-        """Executes the step of each agent type in random order."""
-        agent_types = list(self.agents_by_type.keys())
-        random.shuffle(agent_types)
+        """Executes the step of each active agent type in random order."""
+        self.model.random.shuffle(self._active_types)
 
-        for agent_type in agent_types:
-            agents = list(self.agents_by_type[agent_type].values())
-            random.shuffle(agents)
+        for agent_type in self._active_types:
+            agents = self._active_by_type[agent_type]
+            self.model.random.shuffle(agents)
             for agent in agents:
                 agent.step()
 
@@ -0,0 +1,291 @@
+"""
+-------------------------------------------------
+Group 1 - Project Name
+Created on: 2025-03-11
+Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
+-------------------------------------------------
+
+Description:
+This script saves a running RobotMission to a .npz file and restores it:
+maps, robots (knowledge, carried wastes, inboxes), wastes, disposal zones,
+pickup jobs, pending messages, scheduler order, step counters, stop conditions
+and the states of both random generators, so that a restored run continues
+exactly like the original one. The event log and the profiler are not saved.
+"""
+
+import json
+
+import numpy as np
+
+from agents import GreenRobot, YellowRobot, RedRobot
+from objects import Waste, WasteDisposalZone
+from messages import Message
+from jobs import PickupJob
+from accounting import WASTE_TYPES
+
+FORMAT_VERSION = 2
+ROBOT_TYPES = (GreenRobot, YellowRobot, RedRobot)
+NONE = -1
+MODEL_VAR_PREFIX = "model_var:"
+
+
+def encode_position(pos):
+    return (NONE, NONE) if pos is None else pos
+
+
+def decode_position(row):
+    return None if row[0] == NONE else (int(row[0]), int(row[1]))
+
+
+def identifier(entity):
+    return NONE if entity is None else entity.unique_id
+
+
+def positions(rows):
+    return np.array(rows, dtype=np.int32).reshape(-1, 2)
+
+
+def index_orders(indexes, key):
+    """Items of the bucket indexes in insertion order and in bucket order (ties in nearest depend on both)."""
+    inserted = [key(item) for index in indexes for item in index.positions]
+    bucketed = [key(item) for index in indexes for bucket in index.buckets.values() for item in bucket]
+    return inserted, bucketed
+
+
+def restore_index(index, inserted, bucketed, position):
+    index.positions = {item: position(item) for item in inserted}
+    index.buckets = {}
+    for item in bucketed:
+        pos = index.positions[item]
+        index.buckets.setdefault(index.bucket_of(pos), {})[item] = pos
+
+
+def save_snapshot(model, path, compressed=True):
+    """Writes the state of model to path (.npz)."""
+    robots = [agent for agent_type in ROBOT_TYPES for agent in model.robot_index[agent_type].positions]
+    wastes = []
+    disposal_zones = []
+    grid_order = []
+    for contents, _ in model.grid.coord_iter():
+        for entity in contents:
+            grid_order.append(entity.unique_id)
+            if isinstance(entity, Waste):
+                wastes.append(entity)
+            elif isinstance(entity, WasteDisposalZone):
+                disposal_zones.append(entity)
+
+    carried = [(robot.unique_id, waste.unique_id, WASTE_TYPES.index(waste.waste_type))
+               for robot in robots for waste in robot.knowledge.collected_waste]
+    messages = [(robot, message, False) for robot in robots for message in robot.knowledge.inbox]
+    messages += [(recipient, message, True) for recipient, message in model.message_bus.pending.values()]
+    jobs = list(model.jobs.jobs.values())
+    schedule = model.schedule
+    robot_inserted, robot_bucketed = index_orders(model.robot_index.values(), lambda robot: robot.unique_id)
+    frontier_inserted, frontier_bucketed = index_orders(model.frontier_index.values(), lambda cell: cell)
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "parameters": {
+            "width": model.grid.width,
+            "height": model.grid.height,
+            "initial_green_waste": model.initial_green_waste,
+            "initial_yellow_waste": model.initial_yellow_waste,
+            "initial_red_waste": model.initial_red_waste,
+            "nb_yellow_agent": model.nb_yellow_agent,
+            "nb_green_agent": model.nb_green_agent,
+            "nb_red_agent": model.nb_red_agent,
+            "seed": model.seed,
+            "stop_when_finished": model.stop_conditions.stop_when_finished,
+            "kpi_fraction": model.stop_conditions.kpi_fraction,
+            "stall_steps": model.stop_conditions.stall_steps,
+        },
+        "stop_conditions": {key: getattr(model.stop_conditions, key) for key in ("triggered", "last_counts", "last_progress_step")},
+        "pheromone_decay_rate": model.pheromone_decay_rate,
+        "steps": model.steps,
+        "schedule_steps": schedule.steps,
+        "schedule_time": schedule.time,
+        "running": model.running,
+        "current_id": model.current_id,
+        "initial_waste_count": model.initial_waste_count,
+        "waste_counts": model.waste_counts,
+        "ground_waste_by_zone": {str(zone): counts for zone, counts in model.ground_waste_by_zone.items()},
+        "active_types": [ROBOT_TYPES.index(agent_type) for agent_type in schedule._active_types],
+        "random_state": model.random.getstate(),
+        "rng_state": model.rng.bit_generator.state,
+        "message_bus": {key: getattr(model.message_bus, key) for key in ("sent", "coalesced", "delivered", "broadcasts")},
+        "jobs": {key: getattr(model.jobs, key) for key in ("next_job_id", "posted", "completed", "reassigned")},
+        "model_var_names": list(model.datacollector.model_vars),
+    }
+
+    arrays = {
+        "meta": np.array(json.dumps(meta)),
+        # One numeric array per DataCollector reporter ("model_var:Waste", ...)
+        **{MODEL_VAR_PREFIX + name: np.asarray(values) for name, values in model.datacollector.model_vars.items()},
+        "zone_map": model.zone_map,
+        "radioactivity_map": model.radioactivity_map,
+        "explored_map": model.explored_map,
+        "frontier_map": model.frontier_map,
+        "frontier_inserted": positions(frontier_inserted),
+        "frontier_bucketed": positions(frontier_bucketed),
+        "robot_bucketed": np.array(robot_bucketed, dtype=np.int64),
+        "grid_order": np.array(grid_order, dtype=np.int64),
+        # Active robots in scheduler order, type after type
+        "active_order": np.array([agent.unique_id for agent in schedule.active_agents], dtype=np.int64),
+        "robot_id": np.array([robot.unique_id for robot in robots], dtype=np.int64),
+        "robot_type": np.array([ROBOT_TYPES.index(type(robot)) for robot in robots], dtype=np.int8),
+        "robot_pos": positions([robot.pos for robot in robots]),
+        "robot_waste_here": np.array([robot.knowledge.waste_here for robot in robots], dtype=bool),
+        "robot_is_exploring": np.array([robot.knowledge.is_exploring for robot in robots], dtype=bool),
+        "robot_current_position": positions([encode_position(robot.knowledge.current_position) for robot in robots]),
+        "robot_target": positions([encode_position(robot.knowledge.target_location) for robot in robots]),
+        "robot_frontier_target": positions([encode_position(robot.knowledge.frontier_target) for robot in robots]),
+        "carried": np.array(carried, dtype=np.int64).reshape(-1, 3),
+        "waste_id": np.array([waste.unique_id for waste in wastes], dtype=np.int64),
+        "waste_type": np.array([WASTE_TYPES.index(waste.waste_type) for waste in wastes], dtype=np.int8),
+        "waste_pos": positions([waste.pos for waste in wastes]),
+        "disposal_id": np.array([zone.unique_id for zone in disposal_zones], dtype=np.int64),
+        "disposal_pos": positions([zone.pos for zone in disposal_zones]),
+        "message_recipient": np.array([recipient.unique_id for recipient, _, _ in messages], dtype=np.int64),
+        "message_pending": np.array([pending for _, _, pending in messages], dtype=bool),
+        "message_kind": np.array([message.kind for _, message, _ in messages], dtype=str),
+        "message_sender": np.array([identifier(message.sender) for _, message, _ in messages], dtype=np.int64),
+        "message_location": positions([encode_position(message.location) for _, message, _ in messages]),
+        "message_waste_id": np.array([NONE if message.waste_id is None else message.waste_id for _, message, _ in messages], dtype=np.int64),
+        "message_step": np.array([NONE if message.step is None else message.step for _, message, _ in messages], dtype=np.int64),
+        "job_id": np.array([job.job_id for job in jobs], dtype=np.int64),
+        "job_waste_id": np.array([job.waste.unique_id for job in jobs], dtype=np.int64),
+        "job_robot_type": np.array([ROBOT_TYPES.index(job.robot_class) for job in jobs], dtype=np.int8),
+        "job_location": positions([job.location for job in jobs]),
+        "job_steps": np.array([[job.posted_step,
+                                NONE if job.assigned_step is None else job.assigned_step,
+                                NONE if job.deadline is None else job.deadline,
+                                NONE if job.excluded_until is None else job.excluded_until] for job in jobs],
+                              dtype=np.int64).reshape(-1, 4),
+        "job_robot": np.array([identifier(job.robot) for job in jobs], dtype=np.int64),
+        "job_excluded_robot": np.array([identifier(job.excluded_robot) for job in jobs], dtype=np.int64),
+    }
+    (np.savez_compressed if compressed else np.savez)(path, **arrays)
+
+
+def load_snapshot(path, model_class, log_level=None, log_capacity=1000, profile=False):
+    """Rebuilds a model of model_class from a file written by save_snapshot."""
+    with np.load(path) as data:
+        data = dict(data)
+    meta = json.loads(str(data["meta"]))
+    if meta["version"] != FORMAT_VERSION:
+        raise ValueError(f"unsupported snapshot version {meta['version']}")
+
+    model = model_class(**meta["parameters"], log_level=log_level, log_capacity=log_capacity, profile=profile, populate=False)
+    # Maps are updated in place: the frontier and the coverage pyramid refer to them
+    model.zone_map[...] = data["zone_map"]
+    model.radioactivity_map[...] = data["radioactivity_map"]
+    model.explored_map[...] = data["explored_map"]
+    model.neighbor_masks = model.build_neighbor_masks()
+    model.neighborhoods = model.neighbor_masks[RedRobot]
+    model.pheromone_decay_rate = meta["pheromone_decay_rate"]
+
+    entities = {}
+    for unique_id, type_index, pos, waste_here, is_exploring, current, target, frontier in zip(
+            data["robot_id"].tolist(), data["robot_type"].tolist(), data["robot_pos"], data["robot_waste_here"].tolist(),
+            data["robot_is_exploring"].tolist(), data["robot_current_position"], data["robot_target"],
+            data["robot_frontier_target"]):
+        robot = ROBOT_TYPES[type_index](unique_id, model)
+        knowledge = robot.knowledge
+        knowledge.waste_here = waste_here
+        knowledge.is_exploring = is_exploring
+        knowledge.current_position = decode_position(current)
+        knowledge.target_location = decode_position(target)
+        knowledge.frontier_target = decode_position(frontier)
+        robot.pos = decode_position(pos)
+        entities[unique_id] = robot
+    for robot_id, waste_id, type_index in data["carried"].tolist():
+        entities[robot_id].knowledge.collected_waste.append(Waste(waste_id, model, WASTE_TYPES[type_index]))
+    for unique_id, type_index, pos in zip(data["waste_id"].tolist(), data["waste_type"].tolist(), data["waste_pos"]):
+        waste = Waste(unique_id, model, WASTE_TYPES[type_index])
+        waste.pos = decode_position(pos)
+        entities[unique_id] = waste
+    for unique_id, pos in zip(data["disposal_id"].tolist(), data["disposal_pos"]):
+        zone = WasteDisposalZone(unique_id, model)
+        zone.pos = decode_position(pos)
+        entities[unique_id] = zone
+
+    # Same order of entities within every cell as in the saved grid
+    for unique_id in data["grid_order"].tolist():
+        entity = entities[unique_id]
+        pos = entity.pos
+        entity.pos = None
+        model.grid.place_agent(entity, pos)
+    schedule = model.schedule
+    for unique_id in sorted(entities):
+        schedule.add(entities[unique_id])
+    robot_ids = data["robot_id"].tolist()
+    robot_bucketed = data["robot_bucketed"].tolist()
+    for agent_type, index in model.robot_index.items():
+        restore_index(index, [entities[i] for i in robot_ids if type(entities[i]) is agent_type],
+                      [entities[i] for i in robot_bucketed if type(entities[i]) is agent_type], lambda robot: robot.pos)
+    schedule._active_types[:] = [ROBOT_TYPES[index] for index in meta["active_types"]]
+    for agent_type in schedule._active_types:
+        schedule._active_by_type[agent_type] = []
+    for unique_id in data["active_order"].tolist():
+        robot = entities[unique_id]
+        schedule._active_by_type[type(robot)].append(robot)
+
+    for recipient_id, pending, kind, sender_id, location, waste_id, step in zip(
+            data["message_recipient"].tolist(), data["message_pending"].tolist(), data["message_kind"].tolist(),
+            data["message_sender"].tolist(), data["message_location"], data["message_waste_id"].tolist(),
+            data["message_step"].tolist()):
+        recipient = entities[recipient_id]
+        location = decode_position(location)
+        message = Message(kind, entities.get(sender_id), location,
+                          None if waste_id == NONE else waste_id, None if step == NONE else step)
+        if pending:
+            model.message_bus.pending[(recipient_id, kind, location)] = (recipient, message)
+        else:
+            recipient.knowledge.inbox.append(message)
+    for key, value in meta["message_bus"].items():
+        setattr(model.message_bus, key, value)
+
+    jobs = model.jobs
+    for job_id, waste_id, type_index, location, (posted, assigned, deadline, excluded_until), robot_id, excluded_id in zip(
+            data["job_id"].tolist(), data["job_waste_id"].tolist(), data["job_robot_type"].tolist(), data["job_location"],
+            data["job_steps"].tolist(), data["job_robot"].tolist(), data["job_excluded_robot"].tolist()):
+        job = PickupJob(job_id, entities[waste_id], ROBOT_TYPES[type_index], decode_position(location), posted)
+        job.robot = entities.get(robot_id)
+        job.assigned_step = None if assigned == NONE else assigned
+        job.deadline = None if deadline == NONE else deadline
+        job.excluded_robot = entities.get(excluded_id)
+        job.excluded_until = None if excluded_until == NONE else excluded_until
+        jobs.jobs[waste_id] = job
+        if job.robot is not None:
+            jobs.assignments[job.robot] = job
+    for key, value in meta["jobs"].items():
+        setattr(jobs, key, value)
+
+    stop_conditions = meta["stop_conditions"]
+    model.stop_conditions.triggered = stop_conditions["triggered"]
+    last_counts = stop_conditions["last_counts"]
+    model.stop_conditions.last_counts = None if last_counts is None else tuple(last_counts)
+    model.stop_conditions.last_progress_step = stop_conditions["last_progress_step"]
+    model.current_id = meta["current_id"]
+    model.initial_waste_count = meta["initial_waste_count"]
+    model.waste_counts = meta["waste_counts"]
+    model.ground_waste_by_zone = {int(zone): counts for zone, counts in meta["ground_waste_by_zone"].items()}
+    model.steps = meta["steps"]
+    schedule.steps = meta["schedule_steps"]
+    schedule.time = meta["schedule_time"]
+    model.running = meta["running"]
+    for name in meta["model_var_names"]:
+        model.datacollector.model_vars[name] = data[MODEL_VAR_PREFIX + name].tolist()
+    version, state, gauss = meta["random_state"]
+    model.random.setstate((version, tuple(state), gauss))
+    model.rng.bit_generator.state = meta["rng_state"]
+
+    model.frontier_map[...] = data["frontier_map"]
+    frontier_inserted = [tuple(cell) for cell in data["frontier_inserted"].tolist()]
+    frontier_bucketed = [tuple(cell) for cell in data["frontier_bucketed"].tolist()]
+    zone_map = model.zone_map
+    for zone, index in model.frontier_index.items():
+        restore_index(index, [cell for cell in frontier_inserted if zone_map[cell] == zone],
+                      [cell for cell in frontier_bucketed if zone_map[cell] == zone], lambda cell: cell)
+    model.coverage.refresh()
+    return model
@@ -0,0 +1,130 @@
+"""
+-------------------------------------------------
+Group 1 - Project Name
+Created on: 2025-03-11
+Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
+-------------------------------------------------
+
+Description:
+This script contains the spatial index used to find the closest robot of a type.
+"""
+
+
+class BucketIndex:
+    """
+    Bucketed grid of item positions answering nearest-item queries in Manhattan distance.
+    The grid is cut into square buckets of `bucket_size` cells; a query scans rings of
+    buckets around the queried cell and stops as soon as no farther ring can hold a closer item.
+    """
+
+    def __init__(self, width, height, bucket_size=8):
+        self.width = width
+        self.height = height
+        self.bucket_size = bucket_size
+        self.nb_buckets_x = (width + bucket_size - 1) // bucket_size
+        self.nb_buckets_y = (height + bucket_size - 1) // bucket_size
+        self.buckets = {}
+        self.positions = {}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def bucket_of(self, pos):
+        return (pos[0] // self.bucket_size, pos[1] // self.bucket_size)
+
+    def add(self, item, pos):
+        self.positions[item] = pos
+        self.buckets.setdefault(self.bucket_of(pos), {})[item] = pos
+
+    def remove(self, item):
+        pos = self.positions.pop(item)
+        bucket_key = self.bucket_of(pos)
+        bucket = self.buckets[bucket_key]
+        del bucket[item]
+        if not bucket:
+            del self.buckets[bucket_key]
+
+    def move(self, item, new_pos):
+        old_pos = self.positions[item]
+        old_key = self.bucket_of(old_pos)
+        new_key = self.bucket_of(new_pos)
+        self.positions[item] = new_pos
+        if old_key == new_key:
+            self.buckets[old_key][item] = new_pos
+            return
+        bucket = self.buckets[old_key]
+        del bucket[item]
+        if not bucket:
+            del self.buckets[old_key]
+        self.buckets.setdefault(new_key, {})[item] = new_pos
+
+    def nearest(self, pos, accept=None):
+        """Returns the closest item to pos (optionally among those for which accept(item) is true), or None."""
+        if not self.positions:
+            return None
+        x, y = pos
+        bx, by = self.bucket_of(pos)
+        best_item = None
+        best_distance = None
+        max_ring = max(self.nb_buckets_x, self.nb_buckets_y)
+        for ring in range(max_ring + 1):
+            for key in self._ring(bx, by, ring):
+                bucket = self.buckets.get(key)
+                if not bucket:
+                    continue
+                if best_distance is not None and self._bucket_distance(key, x, y) >= best_distance:
+                    continue
+                for item, (ix, iy) in bucket.items():
+                    distance = abs(ix - x) + abs(iy - y)
+                    if best_distance is not None and distance >= best_distance:
+                        continue
+                    if accept is not None and not accept(item):
+                        continue
+                    best_item = item
+                    best_distance = distance
+            # Every cell of the next ring is at least ring * bucket_size + 1 away
+            if best_distance is not None and best_distance <= ring * self.bucket_size:
+                break
+        return best_item
+
+    def _bucket_distance(self, key, x, y):
+        """Lower bound of the distance from (x, y) to any cell of the bucket."""
+        low_x = key[0] * self.bucket_size
+        low_y = key[1] * self.bucket_size
+        dx = low_x - x if x < low_x else max(x - (low_x + self.bucket_size - 1), 0)
+        dy = low_y - y if y < low_y else max(y - (low_y + self.bucket_size - 1), 0)
+        return dx + dy
+
+    def within(self, pos, radius):
+        """Returns the items at Manhattan distance at most radius from pos."""
+        x, y = pos
+        bx, by = self.bucket_of(pos)
+        reach = radius // self.bucket_size + 1
+        items = []
+        for key_x in range(max(bx - reach, 0), min(bx + reach, self.nb_buckets_x - 1) + 1):
+            for key_y in range(max(by - reach, 0), min(by + reach, self.nb_buckets_y - 1) + 1):
+                bucket = self.buckets.get((key_x, key_y))
+                if not bucket:
+                    continue
+                for item, (ix, iy) in bucket.items():
+                    if abs(ix - x) + abs(iy - y) <= radius:
+                        items.append(item)
+        return items
+
+    def _ring(self, bx, by, ring):
+        """Yields the in-bounds bucket keys at Chebyshev distance `ring` from (bx, by)."""
+        if ring == 0:
+            yield (bx, by)
+            return
+        x_min, x_max = bx - ring, bx + ring
+        y_min, y_max = by - ring, by + ring
+        for key_x in range(max(x_min, 0), min(x_max, self.nb_buckets_x - 1) + 1):
+            if y_min >= 0:
+                yield (key_x, y_min)
+            if y_max < self.nb_buckets_y:
+                yield (key_x, y_max)
+        for key_y in range(max(y_min + 1, 0), min(y_max - 1, self.nb_buckets_y - 1) + 1):
+            if x_min >= 0:
+                yield (x_min, key_y)
+            if x_max < self.nb_buckets_x:
+                yield (x_max, key_y)
@@ -0,0 +1,72 @@
+"""
+-------------------------------------------------
+Group 1 - Project Name
+Created on: 2025-03-11
+Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
+-------------------------------------------------
+
+Description:
+This script contains the stop conditions of a run (mission finished, KPI
+fraction reached, no progress for a number of steps), checked after every
+step from the waste counters of the model. When one of them triggers, the
+model sets `running` to False, which ends Mesa's batch_run and batch.py runs.
+"""
+
+FINISHED = "finished"
+ALL_DISPOSED = "all_disposed"
+KPI_REACHED = "kpi_reached"
+NO_PROGRESS = "no_progress"
+
+
+class StopConditions:
+    """
+    `triggered` maps each condition to the first step at which it held. finished (no waste left on
+    the ground and no robot holding a full load, so no pair can be completed any more: the single
+    wastes still carried are never disposed) is always tracked, kpi_reached only with a `kpi_fraction`
+    and no_progress (waste counters unchanged for `stall_steps` steps) only with `stall_steps`.
+    all_disposed (nothing on the ground nor carried) is recorded but does not stop the run; it
+    implies finished. `stop_when_finished=False` keeps the run going once it is finished.
+    """
+
+    def __init__(self, stop_when_finished=True, kpi_fraction=None, stall_steps=None):
+        self.stop_when_finished = stop_when_finished
+        self.kpi_fraction = kpi_fraction
+        self.stall_steps = stall_steps
+        self.triggered = {}
+        # Waste totals (ground, carried, transformed, disposed) at the last change, and its step
+        self.last_counts = None
+        self.last_progress_step = 0
+
+    def update(self, model):
+        """Checks the conditions at the end of a step; returns True when the run must stop."""
+        step = model.steps
+        ground = model.count_waste("ground")
+        carried = model.count_waste("carried")
+        counts = (ground, carried, model.count_waste("transformed"), model.count_waste("disposed"))
+        if counts != self.last_counts:
+            self.last_counts = counts
+            self.last_progress_step = step
+
+        triggered = self.triggered
+        if ground == 0 and FINISHED not in triggered and not model.has_full_loads():
+            triggered[FINISHED] = step
+        if ground == 0 and carried == 0 and ALL_DISPOSED not in triggered:
+            triggered[ALL_DISPOSED] = step
+        if (self.kpi_fraction is not None and KPI_REACHED not in triggered
+                and model.collected_waste_fraction() >= self.kpi_fraction):
+            triggered[KPI_REACHED] = step
+        if (self.stall_steps is not None and NO_PROGRESS not in triggered
+                and step - self.last_progress_step >= self.stall_steps):
+            triggered[NO_PROGRESS] = step
+        return self.should_stop()
+
+    def should_stop(self):
+        triggered = self.triggered
+        return ((self.stop_when_finished and FINISHED in triggered)
+                or KPI_REACHED in triggered or NO_PROGRESS in triggered)
+
+    def reason(self):
+        """Condition that stopped the run (the earliest one), or None."""
+        stopping = [(step, name) for name, step in self.triggered.items()
+                    if name != ALL_DISPOSED and (name != FINISHED or self.stop_when_finished)]
+        return min(stopping)[1] if stopping else None
@@ -0,0 +1,431 @@
+"""
+-------------------------------------------------
+Group 1 - Project Name
+Created on: 2025-03-11
+Authors: Louis LHOTTE, Ambroise MARTIN-ROUVILLE, Edouard SEGUIER
+-------------------------------------------------
+
+Description:
+This script contains a vectorized version of RobotMission for large sites
+(e.g. 1000x1000 cells and thousands of robots). Robots are rows of NumPy
+arrays instead of agents, and every step runs percepts, decisions, conflict
+resolution and moves as array operations over all the robots at once.
+
+Same mission rules and constructor parameters as RobotMission: transformed
+wastes are assigned through a pickup job queue to the closest available robot
+of the next colour (with the same staleness and exclusion rules as jobs.py),
+loaded red robots descend the BFS distance field of their disposal column and
+sidestep robots in the way, and exploring robots without an unexplored
+neighbour head to the nearest unexplored cell. The remaining differences:
+- Robots act simultaneously instead of one after the other in random order.
+  A robot can only move to a cell that was free at the beginning of the step,
+  and when several robots want the same cell, a random one gets it.
+- Wastes are counts per cell and colour rather than entities: a pickup job is
+  closed once its cell holds fewer wastes of its colour than open jobs (the
+  newest jobs of the cell are closed first).
+- Jobs set the target of their robot directly (there is no message bus), and the
+  exploration target is the nearest unexplored cell given by the coverage
+  quadtree rather than by the frontier index, and at most
+  frontier_queries_per_step robots get a new one at each step (the others
+  move randomly meanwhile); ties are broken differently.
+- There is no event log, profiler nor snapshot.
+"""
+
+import numpy as np
+from mesa import Model, DataCollector
+
+from objects import build_zone_layers, RADIOACTIVITY_RANGES
+from stopping import StopConditions
+from accounting import WASTE_TYPES, WasteAccounting
+from navigation import neighbor_masks, distance_field
+from coverage import CoveragePyramid
+
+GREEN, YELLOW, RED = 0, 1, 2
+# Wastes a robot of each colour carries before transforming (green, yellow) or disposing (red)
+CAPACITY = np.array([2, 2, 1], dtype=np.int8)
+# Von Neumann moves, in the same order as the neighbour masks of RobotMission (navigation.OFFSETS)
+OFFSETS = np.array([(-1, 0), (0, -1), (0, 1), (1, 0)], dtype=np.int32)
+NO_TARGET = -1
+NO_ROBOT = -1
+
+
+class VectorRobotMission(WasteAccounting, Model):
+    def __init__(self, width, height, initial_green_waste, initial_yellow_waste, initial_red_waste, nb_yellow_agent, nb_green_agent, nb_red_agent, log_level=None, log_capacity=None, seed=None, profile=False,
+                 stop_when_finished=True, kpi_fraction=None, stall_steps=None):
+        # log_level, log_capacity and profile are accepted for compatibility with RobotMission and ignored
+        super().__init__(seed=seed)
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.initial_green_waste = initial_green_waste
+        self.initial_yellow_waste = initial_yellow_waste
+        self.initial_red_waste = initial_red_waste
+        self.nb_yellow_agent = nb_yellow_agent
+        self.nb_green_agent = nb_green_agent
+        self.nb_red_agent = nb_red_agent
+        self.pheromone_decay_rate = 0.1
+        self.stop_conditions = StopConditions(stop_when_finished, kpi_fraction, stall_steps)
+
+        z_width = width // 3
+        self.zone_map, self.radioactivity_map = build_zone_layers(width, height, self.rng)
+        self.explored_map = np.zeros((width, height), dtype=bool)
+        # Unexplored cells per tile and per zone (explored_map must only be modified in place)
+        self.coverage = CoveragePyramid(self.zone_map, self.explored_map)
+        # Allowed von Neumann moves of every cell for each colour, indexed by [colour, x, y] (see navigation.py)
+        self.neighbor_masks = np.stack([neighbor_masks(self.zone_map <= zone) for zone in RADIOACTIVITY_RANGES])
+        # Distances to the disposal column of each colour, computed on first use
+        self.disposal_fields = {}
+        # Robots placed on each cell (at most one)
+        self.occupied = np.zeros((width, height), dtype=bool)
+        # Wastes lying on each cell, indexed by [colour, x, y]
+        self.ground = np.zeros((3, width, height), dtype=np.int32)
+
+        # Robot arrays, one row per robot: green robots first, then yellow, then red
+        nb_robots = (nb_green_agent, nb_yellow_agent, nb_red_agent)
+        self.colour = np.repeat(np.arange(3, dtype=np.int8), nb_robots)
+        self.x = np.empty(len(self.colour), dtype=np.int32)
+        self.y = np.empty(len(self.colour), dtype=np.int32)
+        self.carried = np.zeros(len(self.colour), dtype=np.int8)
+        self.target_x = np.full(len(self.colour), NO_TARGET, dtype=np.int32)
+        self.target_y = np.full(len(self.colour), NO_TARGET, dtype=np.int32)
+        self.exploring = np.zeros(len(self.colour), dtype=bool)
+        # Unexplored cell each robot heads to once its surroundings are explored
+        self.frontier_x = np.full(len(self.colour), NO_TARGET, dtype=np.int32)
+        self.frontier_y = np.full(len(self.colour), NO_TARGET, dtype=np.int32)
+        # Exploration targets searched in the coverage quadtree at each step (see choose_exploration_moves)
+        self.frontier_queries_per_step = 32
+        # Highest zone id each robot may enter (green 1, yellow 2, red 3)
+        self.max_zone = self.colour + 1
+        # x of the disposal column of each robot
+        self.disposal_x = np.array([z_width - 1, 2 * z_width - 1, width - 1], dtype=np.int32)[self.colour]
+
+        # Same starting areas as RobotMission: x in [0, z_width - 1), [0, 2 * z_width - 1), [0, width - 1)
+        start = 0
+        for colour, x_end in zip(range(3), (z_width - 1, 2 * z_width - 1, width - 1)):
+            self.place_robots(slice(start, start + nb_robots[colour]), x_end)
+            start += nb_robots[colour]
+
+        self.init_waste_counts(initial_green_waste, initial_yellow_waste, initial_red_waste)
+        for colour, count, (x_start, x_end) in zip(range(3), (initial_green_waste, initial_yellow_waste, initial_red_waste),
+                                                   ((0, z_width - 1), (z_width, 2 * z_width - 1), (2 * z_width, width - 1))):
+            xs = self.rng.integers(x_start, x_end, size=count)
+            ys = self.rng.integers(0, height, size=count)
+            self.add_ground_wastes(np.full(count, colour), xs, ys, 1)
+
+        # Pickup jobs, one row per transformed waste waiting for a robot of the next colour, oldest first
+        self.stale_margin = 10
+        self.job_x = np.empty(0, dtype=np.int32)
+        self.job_y = np.empty(0, dtype=np.int32)
+        self.job_colour = np.empty(0, dtype=np.int8)
+        self.job_robot = np.empty(0, dtype=np.int64)
+        self.job_deadline = np.empty(0, dtype=np.int64)
+        # Robot that let the job go stale, not given the job again before excluded_until
+        self.job_excluded = np.empty(0, dtype=np.int64)
+        self.job_excluded_until = np.empty(0, dtype=np.int64)
+        self.jobs_posted = 0
+        self.jobs_completed = 0
+        self.jobs_reassigned = 0
+
+        self.datacollector = DataCollector(self.waste_reporters())
+
+    def place_robots(self, robots, x_end):
+        "Places robots on distinct free cells with x in [0, x_end)."
+        free = np.flatnonzero(~self.occupied[:x_end].ravel())
+        count = robots.stop - robots.start
+        if count > len(free):
+            raise ValueError(f"{count} robots do not fit on the {len(free)} free cells of their starting area")
+        cells = self.rng.choice(free, size=count, replace=False)
+        self.x[robots], self.y[robots] = np.divmod(cells, self.height)
+        self.occupied[self.x[robots], self.y[robots]] = True
+
+    @property
+    def nb_robots(self):
+        return len(self.colour)
+
+    def step(self):
+        self.assign_jobs()
+        x, y, colour = self.x, self.y, self.colour
+
+        # Percepts
+        waste_here = self.ground[colour, x, y] > 0
+        self.mark_explored(np.flatnonzero(self.exploring))
+
+        # Deliberation, with the priorities of the robots' deliberate methods
+        has_target = self.target_x != NO_TARGET
+        at_target = has_target & (x == self.target_x) & (y == self.target_y)
+        self.target_x[at_target] = NO_TARGET
+        self.target_y[at_target] = NO_TARGET
+        to_target = has_target & ~at_target
+        free_to_act = ~to_target
+        collect = free_to_act & waste_here & (self.carried < CAPACITY[colour])
+        transform = free_to_act & ~collect & (colour != RED) & (self.carried == 2)
+        dispose = free_to_act & ~collect & (colour == RED) & (self.carried == 1)
+        explore = free_to_act & ~collect & ~transform & ~dispose
+        self.exploring[collect | transform | dispose] = False
+        self.exploring[explore] = True
+
+        self.collect_wastes(np.flatnonzero(collect))
+        self.transform_wastes(np.flatnonzero(transform))
+        at_column = dispose & (x == self.disposal_x)
+        self.dispose_wastes(np.flatnonzero(at_column))
+
+        # Moves: towards the target, towards the disposal column, or exploring
+        new_x = x.copy()
+        new_y = y.copy()
+        new_x[to_target] += np.sign(self.target_x[to_target] - x[to_target])
+        new_y[to_target] += np.sign(self.target_y[to_target] - y[to_target])
+        to_column = np.flatnonzero(dispose & ~at_column)
+        new_x[to_column], new_y[to_column] = self.choose_disposal_moves(to_column)
+        explorers = np.flatnonzero(explore)
+        new_x[explorers], new_y[explorers] = self.choose_exploration_moves(explorers)
+        moving = to_target | dispose | explore
+        # Like move_towards_target, the target is dropped once the robot tries to step onto it
+        reached = to_target & (new_x == self.target_x) & (new_y == self.target_y)
+        self.target_x[reached] = NO_TARGET
+        self.target_y[reached] = NO_TARGET
+        self.move_robots(np.flatnonzero(moving & ((new_x != x) | (new_y != y))), new_x, new_y)
+
+        self.datacollector.collect(self)
+        self.reset_old_explorations()
+        if self.stop_conditions.update(self):
+            self.running = False
+
+    def add_ground_wastes(self, colour, xs, ys, delta):
+        "Adds delta wastes of each colour on the cells (xs, ys), keeping the counters by state and by zone up to date."
+        np.add.at(self.ground, (colour, xs, ys), delta)
+        counts = np.zeros((3, len(RADIOACTIVITY_RANGES) + 1), dtype=np.int64)
+        np.add.at(counts, (colour, self.zone_map[xs, ys]), delta)
+        for c, waste_type in enumerate(WASTE_TYPES):
+            self.waste_counts["ground"][waste_type] += int(counts[c].sum())
+            for zone in RADIOACTIVITY_RANGES:
+                self.ground_waste_by_zone[zone][waste_type] += int(counts[c, zone])
+
+    def has_full_loads(self):
+        "True while a robot holds a full load, i.e. can still transform or dispose of wastes."
+        return bool((self.carried >= CAPACITY[self.colour]).any())
+
+    def mark_explored(self, robots):
+        "Marks the cells of the robots as explored and updates the coverage pyramid."
+        xs, ys = self.x[robots], self.y[robots]
+        new = ~self.explored_map[xs, ys]
+        xs, ys = xs[new], ys[new]
+        self.explored_map[xs, ys] = True
+        self.coverage.mark_explored_cells(xs, ys)
+
+    def collect_wastes(self, robots):
+        "Each robot picks up one waste of its colour from its cell (robots never share a cell)."
+        if len(robots) == 0:
+            return
+        colour = self.colour[robots]
+        self.add_ground_wastes(colour, self.x[robots], self.y[robots], -1)
+        self.carried[robots] += 1
+        counts = np.bincount(colour, minlength=3)
+        for c, waste_type in enumerate(WASTE_TYPES):
+            self.waste_counts["carried"][waste_type] += int(counts[c])
+        self.close_collected_jobs()
+
+    def transform_wastes(self, robots):
+        "Green and yellow robots turn their two wastes into one of the next colour and post a pickup job for it."
+        if len(robots) == 0:
+            return
+        colour = self.colour[robots]
+        self.carried[robots] = 0
+        self.add_ground_wastes(colour + 1, self.x[robots], self.y[robots], 1)
+        counts = np.bincount(colour, minlength=3)
+        for c in (GREEN, YELLOW):
+            self.waste_counts["carried"][WASTE_TYPES[c]] -= 2 * int(counts[c])
+            self.waste_counts["transformed"][WASTE_TYPES[c]] += 2 * int(counts[c])
+        self.post_jobs(colour + 1, self.x[robots], self.y[robots])
+
+    def dispose_wastes(self, robots):
+        "Red robots standing on the disposal column dispose of their waste."
+        self.carried[robots] = 0
+        self.waste_counts["carried"]["red"] -= len(robots)
+        self.waste_counts["disposed"]["red"] += len(robots)
+
+    def post_jobs(self, colour, xs, ys):
+        count = len(colour)
+        self.job_x = np.concatenate([self.job_x, xs])
+        self.job_y = np.concatenate([self.job_y, ys])
+        self.job_colour = np.concatenate([self.job_colour, colour.astype(np.int8)])
+        self.job_robot = np.concatenate([self.job_robot, np.full(count, NO_ROBOT)])
+        self.job_deadline = np.concatenate([self.job_deadline, np.zeros(count, dtype=np.int64)])
+        self.job_excluded = np.concatenate([self.job_excluded, np.full(count, NO_ROBOT)])
+        self.job_excluded_until = np.concatenate([self.job_excluded_until, np.full(count, -1)])
+        self.jobs_posted += count
+
+    def release_jobs(self, jobs):
+        "Frees the robots of the given jobs, dropping their target if it is still the job's cell."
+        robots = self.job_robot[jobs]
+        held = robots != NO_ROBOT
+        jobs, robots = jobs[held], robots[held]
+        heading = (self.target_x[robots] == self.job_x[jobs]) & (self.target_y[robots] == self.job_y[jobs])
+        self.target_x[robots[heading]] = NO_TARGET
+        self.target_y[robots[heading]] = NO_TARGET
+        self.job_robot[jobs] = NO_ROBOT
+
+    def close_collected_jobs(self):
+        "Closes the jobs of the wastes that have just been collected (by any robot), as JobQueue.complete."
+        if len(self.job_x) == 0:
+            return
+        remaining = self.ground[self.job_colour, self.job_x, self.job_y]
+        # Rank of every job among the open jobs of its cell and colour, oldest first
+        cells = (self.job_colour.astype(np.int64) * self.width + self.job_x) * self.height + self.job_y
+        order = np.argsort(cells, kind="stable")
+        sorted_cells = cells[order]
+        starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+        group_start = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order)) - group_start
+        closed = rank >= remaining
+        if not closed.any():
+            return
+        self.release_jobs(np.flatnonzero(closed))
+        self.jobs_completed += int(closed.sum())
+        keep = ~closed
+        for name in ("job_x", "job_y", "job_colour", "job_robot", "job_deadline", "job_excluded", "job_excluded_until"):
+            setattr(self, name, getattr(self, name)[keep])
+
+    def assign_jobs(self):
+        """
+        As JobQueue.assign: reopens the stale jobs (robot not there `stale_margin` steps after the travel
+        time, or heading elsewhere) and excludes their robot for `stale_margin` steps, then gives every
+        open job, oldest first, to the closest robot of its colour that is free (no target, no job, room to carry).
+        """
+        if len(self.job_x) == 0:
+            return
+        step = self.steps
+        robots = self.job_robot
+        assigned = robots != NO_ROBOT
+        rx = self.x[robots]
+        ry = self.y[robots]
+        arrived = assigned & (rx == self.job_x) & (ry == self.job_y)
+        elsewhere = (self.target_x[robots] != self.job_x) | (self.target_y[robots] != self.job_y)
+        stale = np.flatnonzero(assigned & ~arrived & ((step > self.job_deadline) | elsewhere))
+        if len(stale):
+            self.job_excluded[stale] = robots[stale]
+            self.job_excluded_until[stale] = step + self.stale_margin
+            self.release_jobs(stale)
+            self.jobs_reassigned += len(stale)
+
+        open_jobs = np.flatnonzero(self.job_robot == NO_ROBOT)
+        if len(open_jobs) == 0:
+            return
+        busy = np.zeros(self.nb_robots, dtype=bool)
+        busy[self.job_robot[self.job_robot != NO_ROBOT]] = True
+        available = ~busy & (self.target_x == NO_TARGET) & (self.carried < CAPACITY[self.colour])
+        for job in open_jobs:
+            candidates = np.flatnonzero(available & (self.colour == self.job_colour[job]))
+            if step <= self.job_excluded_until[job]:
+                candidates = candidates[candidates != self.job_excluded[job]]
+            if len(candidates) == 0:
+                continue
+            jx, jy = self.job_x[job], self.job_y[job]
+            distances = np.abs(self.x[candidates] - jx) + np.abs(self.y[candidates] - jy)
+            best = distances.argmin()
+            robot = candidates[best]
+            available[robot] = False
+            self.job_robot[job] = robot
+            self.job_deadline[job] = step + distances[best] + self.stale_margin
+            self.target_x[robot] = jx
+            self.target_y[robot] = jy
+            self.exploring[robot] = False
+
+    def disposal_distance_field(self, colour):
+        "Moves from every cell to the disposal column of colour (-1 where it cannot go), as RobotMission."
+        field = self.disposal_fields.get(colour)
+        if field is None:
+            column = (self.width // 3 - 1, 2 * (self.width // 3) - 1, self.width - 1)[colour]
+            field = distance_field(self.neighbor_masks[colour], [(column, y) for y in range(self.height)])
+            self.disposal_fields[colour] = field
+        return field
+
+    def neighbors(self, robots):
+        "Neighbour cells of each robot (n, 4), clipped to the grid, and whether each move is allowed for its colour."
+        x, y = self.x[robots], self.y[robots]
+        masks = self.neighbor_masks[self.colour[robots], x, y]
+        allowed = (masks[:, None] >> np.arange(4, dtype=np.uint8)) & 1 == 1
+        cx = np.clip(x[:, None] + OFFSETS[None, :, 0], 0, self.width - 1)
+        cy = np.clip(y[:, None] + OFFSETS[None, :, 1], 0, self.height - 1)
+        return cx, cy, allowed
+
+    def pick_moves(self, robots, cx, cy, pool):
+        "Uniform choice among the cells of each row of pool; robots with an empty pool stay."
+        score = self.rng.random(pool.shape)
+        score[~pool] = -1
+        choice = score.argmax(axis=1)
+        rows = np.arange(len(robots))
+        stays = ~pool[rows, choice]
+        return (np.where(stays, self.x[robots], cx[rows, choice]),
+                np.where(stays, self.y[robots], cy[rows, choice]))
+
+    def choose_disposal_moves(self, robots):
+        "As move_agent_towards_disposal_zone: a free neighbour closer to the column, else a free one at the same distance."
+        cx, cy, allowed = self.neighbors(robots)
+        distance = np.empty(len(robots), dtype=np.int32)
+        reach = np.empty(cx.shape, dtype=np.int32)
+        for colour in np.unique(self.colour[robots]):
+            rows = self.colour[robots] == colour
+            field = self.disposal_distance_field(int(colour))
+            distance[rows] = field[self.x[robots[rows]], self.y[robots[rows]]]
+            reach[rows] = field[cx[rows], cy[rows]]
+        free = allowed & ~self.occupied[cx, cy]
+        closer = free & (reach < distance[:, None])
+        aside = free & (reach == distance[:, None])
+        pool = np.where(closer.any(axis=1)[:, None], closer, aside)
+        return self.pick_moves(robots, cx, cy, pool)
+
+    def choose_exploration_moves(self, robots):
+        """
+        As move_smartly: a random unexplored allowed neighbour; else a free neighbour closer to the
+        nearest unexplored cell (kept as target until explored); else a random allowed neighbour.
+        """
+        cx, cy, allowed = self.neighbors(robots)
+        unexplored = allowed & ~self.explored_map[cx, cy]
+        surrounded = ~unexplored.any(axis=1)
+
+        # New targets for the robots whose target is missing or explored. The quadtree is queried one robot
+        # at a time, so at most frontier_queries_per_step robots (picked at random) get one at each step
+        lost = robots[surrounded]
+        fx, fy = self.frontier_x[lost], self.frontier_y[lost]
+        stale = lost[(fx == NO_TARGET) | self.explored_map[fx, fy]]
+        self.frontier_x[stale] = NO_TARGET
+        self.frontier_y[stale] = NO_TARGET
+        if len(stale) > self.frontier_queries_per_step:
+            stale = self.rng.choice(stale, self.frontier_queries_per_step, replace=False)
+        for robot in stale:
+            cell = self.coverage.nearest_unexplored((self.x[robot], self.y[robot]), int(self.max_zone[robot]))
+            self.frontier_x[robot], self.frontier_y[robot] = cell if cell is not None else (NO_TARGET, NO_TARGET)
+
+        fx = self.frontier_x[robots, None]
+        fy = self.frontier_y[robots, None]
+        distance = np.abs(fx - self.x[robots, None]) + np.abs(fy - self.y[robots, None])
+        closer = (allowed & ~self.occupied[cx, cy] & (fx != NO_TARGET)
+                  & (np.abs(fx - cx) + np.abs(fy - cy) < distance))
+        pool = np.where(surrounded[:, None], np.where(closer.any(axis=1)[:, None], closer, allowed), unexplored)
+        return self.pick_moves(robots, cx, cy, pool)
+
+    def move_robots(self, robots, new_x, new_y):
+        "Moves robots to free allowed cells; among robots wanting the same cell, a random one moves."
+        if len(robots) == 0:
+            return
+        tx, ty = new_x[robots], new_y[robots]
+        valid = ~self.occupied[tx, ty] & (self.zone_map[tx, ty] <= self.max_zone[robots])
+        robots, tx, ty = robots[valid], tx[valid], ty[valid]
+        cells = tx * self.height + ty
+        order = np.lexsort((self.rng.random(len(robots)), cells))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = cells[order][1:] != cells[order][:-1]
+        winners = order[first]
+        robots, tx, ty = robots[winners], tx[winners], ty[winners]
+        self.occupied[self.x[robots], self.y[robots]] = False
+        self.occupied[tx, ty] = True
+        self.x[robots] = tx
+        self.y[robots] = ty
+
+    def reset_old_explorations(self):
+        "Réinitialise périodiquement certaines cellules explorées pour permettre la redécouverte."
+        if self.steps % 30 == 0:
+            forgotten = self.rng.random(self.explored_map.shape) < self.pheromone_decay_rate
+            self.explored_map &= ~forgotten
+            self.coverage.refresh()